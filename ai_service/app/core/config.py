@@ -63,7 +63,7 @@ class Settings(BaseSettings):
     ENABLE_FILE_LOGGING: bool = os.getenv("ENABLE_FILE_LOGGING", "true").lower() == "true"
     
     # Analytics
-    EVENT_LOG_FILE: str = "data/student_events.json"
+    EVENT_LOG_FILE: str = "data/student_events.jsonl"
     ENABLE_ANALYTICS: bool = True
     
     # Rate Limiting
@@ -1,7 +1,10 @@
 """
 Centralized logging configuration for the AI service
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
 import re
@@ -49,6 +52,9 @@ def setup_logger(name: str = "ai_service") -> logging.Logger:
     """
     Configure and return a logger with console and file handlers
     
+    Records are put on a queue and written by a background QueueListener thread,
+    so request handlers never block on console or file I/O.
+    
     Args:
         name: Logger name
         
@@ -74,6 +80,8 @@ def setup_logger(name: str = "ai_service") -> logging.Logger:
         except Exception:
             pass  # Fallback if reconfigure fails
     
+    handlers = []
+    
     # Console Handler with safe formatting
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
@@ -83,7 +91,7 @@ def setup_logger(name: str = "ai_service") -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File Handler (if enabled) - always use UTF-8 for files
     if settings.ENABLE_FILE_LOGGING:
@@ -97,7 +105,14 @@ def setup_logger(name: str = "ai_service") -> logging.Logger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Hand records to a background thread that runs the real handlers
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # flush queued records on exit
     
     return logger
 
@@ -2,8 +2,10 @@
 Utility functions for the AI service
 """
 import hashlib
+import threading
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import List
 from functools import wraps
 from app.core.logger import logger
 
@@ -33,6 +35,47 @@ def timing_decorator(func):
     return sync_wrapper
 
 
+def source_cache(maxsize: int = 1024, max_chars: int = 64 * 1024):
+    """
+    Thread-safe LRU memoization for functions of submitted source text
+    
+    String arguments are keyed by their SHA-256 digest instead of being kept
+    as cache keys, and calls whose strings total more than max_chars are not
+    cached, so memory stays bounded by size as well as entry count.
+    Exceptions are not cached.
+    
+    Args:
+        maxsize: Maximum number of cached results
+        max_chars: Largest total string length that is cached
+    """
+    def decorator(func):
+        entries = OrderedDict()
+        lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(*args):
+            if sum(len(a) for a in args if isinstance(a, str)) > max_chars:
+                return func(*args)
+            key = tuple(
+                hashlib.sha256(a.encode("utf-8", "surrogatepass")).digest() if isinstance(a, str) else a
+                for a in args
+            )
+            with lock:
+                if key in entries:
+                    entries.move_to_end(key)
+                    return entries[key]
+            result = func(*args)
+            with lock:
+                entries[key] = result
+                if len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+
 def sanitize_code(code: str) -> str:
     """
     Sanitize user code to prevent malicious operations
@@ -2,45 +2,154 @@
 PyBlocks AI Service - Main Application
 Production-ready FastAPI service for code analysis and adaptive learning
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
+import ctypes
+import os
 import time
 from pathlib import Path
 
 # Legacy endpoint imports
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import json
 import io
 import ast
 import threading
 import sys
 import re
-from contextlib import redirect_stdout, redirect_stderr
-from datetime import datetime
+from collections import deque
+from queue import SimpleQueue, Empty
+from itertools import islice
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.core.utils import source_cache
 from app.api.router import api_router
 
+# orjson is optional; when installed it is used for the event log and API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, matching what JSONResponse would send"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _event_to_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize one event as a JSON Lines record"""
+    if orjson:
+        return orjson.dumps(entry) + b"\n"
+    return (json.dumps(entry) + "\n").encode("utf-8")
+
 
 # Create necessary directories
 Path("logs").mkdir(exist_ok=True)
 Path("data").mkdir(exist_ok=True)
 
-# In-memory event log for legacy /observe endpoint
-event_log = []
-EVENT_LOG_FILE = "data/student_events.json"
+# Keyword (searched in lowercased code) -> concept reported by /observe, in report order
+CODE_CONCEPT_KEYWORDS = (
+    ("for", "for-loop"),
+    ("while", "while-loop"),
+    ("print", "print"),
+    ("range", "range"),
+)
+# All keywords in one scan; the lookahead also reports overlapping hits (e.g. "forange")
+CODE_CONCEPT_RE = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword, _ in CODE_CONCEPT_KEYWORDS) + "))"
+)
+
+# Error-message patterns used by the legacy /execute hint helpers
+NAME_ERROR_RE = re.compile(r"name '(\w+)' is not defined")
+QUOTED_NAME_RE = re.compile(r"'(\w+)'")
+
+# Expected output of the legacy "print Hello 5 times" mission (already stripped)
+EXPECTED_OBSERVE_OUTPUT = "\n".join(["Hello"] * 5)
+
+# In-memory event log for legacy /observe endpoint, persisted as append-only JSON Lines
+# Only the most recent EVENT_LOG_MAX_IN_MEMORY events are kept in memory; the
+# file keeps the full history and event_stats counts every event
+EVENT_LOG_MAX_IN_MEMORY = 100000
+event_log = deque(maxlen=EVENT_LOG_MAX_IN_MEMORY)
+EVENT_LOG_FILE = "data/student_events.jsonl"
+LEGACY_EVENT_LOG_FILE = "data/student_events.json"  # old full-rewrite JSON array
+event_log_fh = None  # append handle, open while the app is running
+event_log_write_lock = threading.Lock()
+
+# [epoch second, formatted timestamp] reused by events logged within the same second
+_event_timestamp_cache = [None, ""]
+
+# /events response chunk size when streaming
+EVENTS_STREAM_CHUNK_BYTES = 64 * 1024
+
+# Running totals for /analytics, updated as events are logged
+event_stats = {"total_events": 0, "total_attempts": 0, "successful": 0}
+
+
+def count_event(entry: Dict[str, Any]):
+    """Add one logged event to the running analytics totals"""
+    event_stats["total_events"] += 1
+    event_stats["total_attempts"] += entry.get("attempts", 0)
+    if EXPECTED_OBSERVE_OUTPUT in entry.get("output", ""):
+        event_stats["successful"] += 1
+
+# /observe queues events; a background task persists them in batches
+EVENT_FLUSH_BATCH_SIZE = 100  # max events per file write
+EVENT_FLUSH_INTERVAL = 0.05  # seconds to wait for more events before writing
+event_queue: Optional[asyncio.Queue] = None
+
+# Legacy /execute waits for user code in a worker thread so the event loop keeps
+# serving other requests. Submissions still run one at a time so a burst of
+# student code can't starve the server of CPU.
+code_execution_lock = asyncio.Lock()
+
+# Seconds a timed-out /execute thread gets to unwind after being interrupted
+EXECUTION_STOP_GRACE_SECONDS = 1.0
+
+# Cleared StringIO buffers reused for capturing /execute stdout/stderr
+CAPTURE_BUFFER_POOL_MAX = 64
+capture_buffer_pool = SimpleQueue()
 
 # Load existing events if file exists
 try:
     if Path(EVENT_LOG_FILE).exists():
-        with open(EVENT_LOG_FILE, 'r') as f:
-            event_log = json.load(f)
-        logger.info(f"[STARTUP] Loaded {len(event_log)} existing events from {EVENT_LOG_FILE}")
+        with open(EVENT_LOG_FILE, 'rb') as f:
+            loads = orjson.loads if orjson else json.loads
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                # Skip corrupt lines (e.g. one truncated by a crash mid-write)
+                # instead of abandoning the rest of the log
+                try:
+                    entry = loads(line)
+                except ValueError as e:
+                    logger.warning(f"[STARTUP] Skipping corrupt line {line_number} in {EVENT_LOG_FILE}: {e}")
+                    continue
+                if not isinstance(entry, dict):
+                    logger.warning(f"[STARTUP] Skipping non-object line {line_number} in {EVENT_LOG_FILE}")
+                    continue
+                event_log.append(entry)
+                count_event(entry)
+        logger.info(f"[STARTUP] Loaded {event_stats['total_events']} existing events from {EVENT_LOG_FILE}")
+    elif Path(LEGACY_EVENT_LOG_FILE).exists():
+        # One-time migration from the old JSON array format
+        with open(LEGACY_EVENT_LOG_FILE, 'rb') as f:
+            legacy_events = orjson.loads(f.read()) if orjson else json.load(f)
+        with open(EVENT_LOG_FILE, 'wb') as f:
+            f.writelines(_event_to_line(e) for e in legacy_events)
+        for entry in legacy_events:
+            event_log.append(entry)
+            count_event(entry)
+        logger.info(f"[STARTUP] Migrated {len(legacy_events)} events from {LEGACY_EVENT_LOG_FILE} to {EVENT_LOG_FILE}")
 except Exception as e:
     logger.warning(f"[STARTUP] Could not load existing events: {e}")
 
@@ -63,12 +172,25 @@ async def lifespan(app: FastAPI):
     from app.services.feedback_engine import feedback_engine
     from app.services.recommender import recommender
     
+    # Start batched event persistence for /observe
+    global event_queue, event_log_fh
+    event_log_fh = open(EVENT_LOG_FILE, 'ab')
+    event_queue = asyncio.Queue()
+    flush_task = asyncio.create_task(flush_events_periodically(event_queue))
+    
     logger.info("[STARTUP] All services initialized successfully")
     
     yield  # Application runs here
     
     # Shutdown
     logger.info("[SHUTDOWN] Shutting down AI service...")
+    event_queue.put_nowait(None)  # flush anything still queued, then stop
+    await flush_task
+    event_queue = None
+    event_log_fh.flush()
+    os.fsync(event_log_fh.fileno())
+    event_log_fh.close()
+    event_log_fh = None
 
 
 # Create FastAPI application
@@ -106,17 +228,25 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse if orjson else JSONResponse
 )
 
 
 # CORS Middleware
+# Explicit lists let Starlette answer preflights with plain set lookups;
+# these cover every method/header the frontend actually sends.
+CORS_ALLOWED_METHODS = ["GET", "POST"]
+CORS_ALLOWED_HEADERS = ["Content-Type", "Authorization", "X-API-Key"]
+CORS_PREFLIGHT_MAX_AGE = 86400  # Browsers may cache preflight responses for a day
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_ALLOWED_METHODS,
+    allow_headers=CORS_ALLOWED_HEADERS,
+    max_age=CORS_PREFLIGHT_MAX_AGE,
 )
 
 
@@ -203,7 +333,7 @@ async def root():
 
 
 # In-memory event log (will be saved to JSON file)
-# Note: event_log and EVENT_LOG_FILE are initialized at the top of the file
+# Note: event_log (a bounded deque) and EVENT_LOG_FILE are initialized at the top of the file
 
 
 class StudentEvent(BaseModel):
@@ -262,12 +392,12 @@ class AnalyzeErrorRequest(BaseModel):
 
 
 @app.post("/observe", response_model=FeedbackResponse, tags=["Legacy"])
-async def observe(event: StudentEvent):
+async def observe(event: StudentEvent, background_tasks: BackgroundTasks):
     """
     Legacy endpoint: Observe student activity and provide feedback
     Maintained for backwards compatibility with old frontend code
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = event_timestamp()
     
     log_entry = {
         "timestamp": timestamp,
@@ -281,7 +411,12 @@ async def observe(event: StudentEvent):
     }
     
     event_log.append(log_entry)
-    save_events_to_file()
+    count_event(log_entry)
+    if event_queue is not None:
+        event_queue.put_nowait(log_entry)
+    else:
+        # No flush task (lifespan not running): write after the response is sent
+        background_tasks.add_task(append_events_to_file, [log_entry])
     
     feedback = analyze_student_code(event)
     return feedback
@@ -290,13 +425,13 @@ async def observe(event: StudentEvent):
 @app.get("/analytics", tags=["Legacy"])
 async def legacy_analytics():
     """Legacy analytics endpoint (backwards compatibility)"""
-    if not event_log:
+    total_events = event_stats["total_events"]
+    if not total_events:
         return {"message": "No events logged yet"}
     
-    total_events = len(event_log)
-    total_attempts = sum(e.get("attempts", 0) for e in event_log)
+    total_attempts = event_stats["total_attempts"]
     avg_attempts = total_attempts / total_events if total_events > 0 else 0
-    successful = sum(1 for e in event_log if "Hello\nHello\nHello\nHello\nHello" in e.get("output", ""))
+    successful = event_stats["successful"]
     
     return {
         "total_events": total_events,
@@ -310,11 +445,27 @@ async def legacy_analytics():
 
 @app.get("/events", tags=["Legacy"])
 async def get_events(limit: int = 10):
-    """Legacy: Get recent events (for debugging/demo purposes)"""
-    return {
-        "total_events": len(event_log),
-        "recent_events": event_log[-limit:] if event_log else []
-    }
+    """Legacy: Get recent events (for debugging/demo purposes)
+    
+    The body is streamed in chunks so a large `limit` doesn't build the whole
+    JSON document in memory.
+    """
+    events = recent_events(limit)
+    head = f'{{"total_events":{event_stats["total_events"]},"recent_events":['.encode("utf-8")
+    
+    def body():
+        chunk = bytearray(head)
+        for i, entry in enumerate(events):
+            if i:
+                chunk += b","
+            chunk += _dumps_compact(entry)
+            if len(chunk) >= EVENTS_STREAM_CHUNK_BYTES:
+                yield bytes(chunk)
+                chunk.clear()
+        chunk += b"]}"
+        yield bytes(chunk)
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @app.post("/execute", response_model=CodeExecutionResponse, tags=["Legacy"])
@@ -325,8 +476,7 @@ async def execute_code(request: CodeExecutionRequest):
     """
     start_time = time.time()
     
-    input_count = count_input_calls(request.code)
-    input_prompts = extract_input_prompts(request.code)
+    input_count, input_prompts = scan_input_calls(request.code)
     
     if input_count > 0 and (not request.inputs or len(request.inputs) < input_count):
         return CodeExecutionResponse(
@@ -344,11 +494,13 @@ async def execute_code(request: CodeExecutionRequest):
             input_prompts=input_prompts
         )
     
-    success, output, error_info = execute_with_timeout(
-        request.code, 
-        timeout_seconds=5,
-        user_inputs=request.inputs or []
-    )
+    async with code_execution_lock:
+        success, output, error_info = await asyncio.to_thread(
+            execute_with_timeout,
+            request.code,
+            timeout_seconds=5,
+            user_inputs=request.inputs or []
+        )
     
     error = error_info['error']
     error_line = error_info['error_line']
@@ -467,55 +619,59 @@ async def analyze_error(request: AnalyzeErrorRequest):
 
 def analyze_student_code(event: StudentEvent) -> FeedbackResponse:
     """Simple rule-based analysis of student code"""
-    code = event.code.lower()
-    output = event.output
-    attempts = event.attempts
+    # Encouragement only distinguishes attempts up to 6, so bucket higher counts
+    # to let resubmissions hit the cache
+    return _analyze_code(event.code, event.output, min(event.attempts, 6))
+
+
+@source_cache(maxsize=4096)
+def _analyze_code(code: str, output: str, attempts: int) -> FeedbackResponse:
+    """
+    Pure rule logic behind analyze_student_code, memoized so identical
+    resubmissions skip the scans and the response model validation.
+    
+    The returned FeedbackResponse is shared between requests - don't mutate it.
+    """
+    code = code.lower()
     
     feedback = ""
     encouragement = ""
     hint = ""
-    concepts_detected = []
+    keywords_found = set(CODE_CONCEPT_RE.findall(code))
+    concepts_detected = tuple(name for keyword, name in CODE_CONCEPT_KEYWORDS if keyword in keywords_found)
+    concepts = set(concepts_detected)
     
-    if "for" in code:
-        concepts_detected.append("for-loop")
-    if "while" in code:
-        concepts_detected.append("while-loop")
-    if "print" in code:
-        concepts_detected.append("print")
-    if "range" in code:
-        concepts_detected.append("range")
-    
-    expected_output = "Hello\nHello\nHello\nHello\nHello"
-    
-    if output.strip() == expected_output.strip():
+    if output.strip() == EXPECTED_OBSERVE_OUTPUT:
         feedback = "🎉 Perfect! You completed the mission successfully!"
         encouragement = "Great job! You understand how loops work!"
         return FeedbackResponse(
             feedback=feedback,
             encouragement=encouragement,
+            hint=None,
             status="success",
-            concepts_detected=concepts_detected
+            concepts_detected=list(concepts_detected)
         )
     
     if not concepts_detected:
         feedback = "💡 Hmm, I don't see any code yet. Try dragging some blocks!"
         hint = "Look for the 'repeat' or 'print' blocks in the toolbox."
-    elif "for-loop" not in concepts_detected and "while-loop" not in concepts_detected:
+    elif "for-loop" not in concepts and "while-loop" not in concepts:
         feedback = "🔄 You need to use a loop to repeat actions!"
         hint = "Try using a 'repeat' block or a 'for' loop to print 'Hello' multiple times."
-    elif "print" not in concepts_detected:
+    elif "print" not in concepts:
         feedback = "📢 You have a loop, but you need to print something!"
         hint = "Add a 'print' block inside your loop."
-    elif "Hello" not in output:
-        feedback = "🤔 You're printing something, but not 'Hello'."
-        hint = "Make sure you're printing exactly the word 'Hello'."
-    elif output.count("Hello") != 5:
-        count = output.count("Hello")
-        feedback = f"📊 You printed 'Hello' {count} times, but we need exactly 5!"
-        hint = "Check your loop counter. For 5 repetitions, try range(5)."
     else:
-        feedback = "🎯 You're very close! Check your output format."
-        hint = "Make sure each 'Hello' is on its own line."
+        hello_count = output.count("Hello")
+        if hello_count == 0:
+            feedback = "🤔 You're printing something, but not 'Hello'."
+            hint = "Make sure you're printing exactly the word 'Hello'."
+        elif hello_count != 5:
+            feedback = f"📊 You printed 'Hello' {hello_count} times, but we need exactly 5!"
+            hint = "Check your loop counter. For 5 repetitions, try range(5)."
+        else:
+            feedback = "🎯 You're very close! Check your output format."
+            hint = "Make sure each 'Hello' is on its own line."
     
     if attempts == 1:
         encouragement = "💪 Good first try! Keep going!"
@@ -531,54 +687,196 @@ def analyze_student_code(event: StudentEvent) -> FeedbackResponse:
         encouragement=encouragement,
         hint=hint,
         status="needs_improvement",
-        concepts_detected=concepts_detected
+        concepts_detected=list(concepts_detected)
     )
 
 
-def save_events_to_file():
-    """Save event log to JSON file for later analysis"""
+def event_timestamp() -> str:
+    """Local "YYYY-MM-DD HH:MM:SS" timestamp, formatted at most once per second"""
+    now = int(time.time())
+    if now != _event_timestamp_cache[0]:
+        _event_timestamp_cache[0] = now
+        _event_timestamp_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    return _event_timestamp_cache[1]
+
+
+def recent_events(limit: int) -> List[Dict[str, Any]]:
+    """Return the last `limit` events in log order (same semantics as event_log[-limit:])"""
+    if limit > 0:
+        return list(islice(reversed(event_log), limit))[::-1]
+    return list(event_log)[-limit:]
+
+
+def append_events_to_file(events: List[Dict[str, Any]]):
+    """Append events to the JSON Lines event log for later analysis"""
+    data = b"".join(_event_to_line(e) for e in events)
     try:
-        with open(EVENT_LOG_FILE, 'w') as f:
-            json.dump(event_log, f, indent=2)
+        # Writes happen in worker threads (flush task or BackgroundTasks)
+        with event_log_write_lock:
+            if event_log_fh is not None:
+                event_log_fh.write(data)
+                event_log_fh.flush()
+            else:
+                with open(EVENT_LOG_FILE, 'ab') as f:
+                    f.write(data)
     except Exception as e:
         logger.error(f"Error saving events: {e}")
 
 
-def count_input_calls(code: str) -> int:
-    """Count the number of input() calls in the code"""
+async def flush_events_periodically(queue: asyncio.Queue):
+    """
+    Persist queued /observe events in batches.
+    
+    Waits for an event, gathers up to EVENT_FLUSH_BATCH_SIZE more for at most
+    EVENT_FLUSH_INTERVAL seconds, then appends the whole batch in one write
+    instead of writing once per request. The write runs off the event loop. A None
+    entry stops the task after the pending batch is written.
+    """
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        entry = await queue.get()
+        if entry is None:  # shutdown sentinel
+            return
+        batch = [entry]
+        deadline = loop.time() + EVENT_FLUSH_INTERVAL
+        while len(batch) < EVENT_FLUSH_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if entry is None:
+                stopping = True
+                break
+            batch.append(entry)
+        # Append the batch in a worker thread so disk I/O doesn't block requests
+        await asyncio.to_thread(append_events_to_file, batch)
+
+
+def scan_input_calls(code: str) -> Tuple[int, List[str]]:
+    """Count the input() calls in the code and extract their prompt strings in one pass"""
+    input_count, input_prompts = _scan_input_calls(code)
+    return input_count, list(input_prompts)
+
+
+@source_cache(maxsize=2048)
+def _scan_input_calls(code: str) -> Tuple[int, Tuple[str, ...]]:
+    """AST scan behind scan_input_calls, memoized so resubmitted code isn't re-parsed"""
+    # No input() call is possible without the text "input" (non-ASCII source is
+    # still parsed, since identifiers are NFKC-normalized)
+    if code.isascii() and "input" not in code:
+        return 0, ()
+    prompts = []
     try:
         tree = ast.parse(code)
-        count = 0
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == 'input':
-                    count += 1
-        return count
     except:
-        return 0
+        return 0, ()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name) and node.func.id == 'input':
+                if node.args and isinstance(node.args[0], ast.Constant):
+                    prompts.append(node.args[0].value)
+                else:
+                    prompts.append("")
+    return len(prompts), tuple(prompts)
+
+
+@source_cache(maxsize=512)
+def compile_user_code(code: str):
+    """
+    Compile submitted code to a code object, memoized so resubmissions skip
+    parsing and bytecode generation. SyntaxErrors are not cached and are
+    raised again on every call.
+    """
+    # Same filename exec() uses for source strings, so error messages don't change
+    return compile(code, "<string>", "exec")
 
 
-def extract_input_prompts(code: str) -> list:
-    """Extract the prompt strings from input() calls"""
-    prompts = []
+class CodeExecutionTimeout(BaseException):
+    """
+    Raised inside a timed-out /execute thread to stop the user's code.
+    Derives from BaseException so a student's `except Exception:` can't swallow it.
+    """
+
+
+class ThreadRedirectedStream:
+    """
+    Installed once in place of sys.stdout/sys.stderr. Writes go to the calling
+    thread's capture buffer when one is set and to the original stream otherwise,
+    so a timed-out thread that is still running can't clobber later runs.
+    """
+
+    def __init__(self, original):
+        self._original = original
+        self._local = threading.local()
+
+    def redirect(self, stream):
+        """Send this thread's writes to stream (None restores the original)"""
+        self._local.stream = stream
+
+    def _target(self):
+        stream = getattr(self._local, "stream", None)
+        return self._original if stream is None else stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+def thread_redirect(name: str) -> ThreadRedirectedStream:
+    """Return the ThreadRedirectedStream installed as sys.<name>, installing it on first use"""
+    stream = getattr(sys, name)
+    if not isinstance(stream, ThreadRedirectedStream):
+        stream = ThreadRedirectedStream(stream)
+        setattr(sys, name, stream)
+    return stream
+
+
+def interrupt_thread(thread: threading.Thread):
+    """
+    Asynchronously raise CodeExecutionTimeout in a running thread.
+    
+    The exception is only delivered between bytecodes, so it can't interrupt a
+    thread blocked in a C call (time.sleep, blocking I/O); such a thread keeps
+    running until the call returns.
+    """
+    thread_id = ctypes.c_ulong(thread.ident)
+    modified = ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, ctypes.py_object(CodeExecutionTimeout))
+    if modified > 1:
+        # Should never happen; undo rather than interrupt the wrong threads
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, None)
+
+
+def acquire_capture_buffer() -> io.StringIO:
+    """Take an empty StringIO from the pool, or create one"""
     try:
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == 'input':
-                    if node.args and isinstance(node.args[0], ast.Constant):
-                        prompts.append(node.args[0].value)
-                    else:
-                        prompts.append("")
-        return prompts
-    except:
-        return []
+        return capture_buffer_pool.get_nowait()
+    except Empty:
+        return io.StringIO()
+
+
+def release_capture_buffer(buffer: io.StringIO):
+    """Clear a capture buffer and return it to the pool (if the pool isn't full)"""
+    if capture_buffer_pool.qsize() < CAPTURE_BUFFER_POOL_MAX:
+        buffer.seek(0)
+        buffer.truncate()
+        capture_buffer_pool.put(buffer)
 
 
 def execute_with_timeout(code: str, timeout_seconds: int = 5, user_inputs: list = None):
     """Execute Python code with a timeout using threading"""
-    stdout_capture = io.StringIO()
-    stderr_capture = io.StringIO()
+    stdout_capture = acquire_capture_buffer()
+    stderr_capture = acquire_capture_buffer()
+    stdout_redirect = thread_redirect("stdout")
+    stderr_redirect = thread_redirect("stderr")
     
     success = False
     output = ""
@@ -614,15 +912,19 @@ def execute_with_timeout(code: str, timeout_seconds: int = 5, user_inputs: list
                 'input': mock_input,
             }
             
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                exec(code, exec_globals)
+            stdout_redirect.redirect(stdout_capture)
+            stderr_redirect.redirect(stderr_capture)
+            exec(compile_user_code(code), exec_globals)
             
-            execution_state['output'] = stdout_capture.getvalue()
-            execution_state['stderr'] = stderr_capture.getvalue()
             execution_state['completed'] = True
             
         except Exception as e:
             execution_state['exception'] = e
+        except CodeExecutionTimeout:
+            pass  # stopped by execute_with_timeout after the deadline
+        finally:
+            stdout_redirect.redirect(None)
+            stderr_redirect.redirect(None)
             execution_state['output'] = stdout_capture.getvalue()
             execution_state['stderr'] = stderr_capture.getvalue()
     
@@ -630,7 +932,20 @@ def execute_with_timeout(code: str, timeout_seconds: int = 5, user_inputs: list
     thread.start()
     thread.join(timeout=timeout_seconds)
     
-    if thread.is_alive():
+    if not thread.is_alive():
+        # The join succeeded, so nothing can write to the buffers any more. A
+        # timed-out thread may still be printing, so its buffers are never pooled.
+        release_capture_buffer(stdout_capture)
+        release_capture_buffer(stderr_capture)
+    else:
+        # Threads can't be killed, so stop the user's code from the inside instead
+        # of leaving an infinite loop burning CPU until the process exits. Output
+        # is redirected per thread, so a thread that outlives this can't touch
+        # later runs.
+        interrupt_thread(thread)
+        thread.join(timeout=EXECUTION_STOP_GRACE_SECONDS)
+        if thread.is_alive():
+            logger.warning(f"[EXECUTE] Timed-out thread still running {EXECUTION_STOP_GRACE_SECONDS}s after interrupt (likely blocked in a C call)")
         success = False
         error_info['error_type'] = "Timeout Error"
         error_info['error'] = f"Your code took too long to run (more than {timeout_seconds} seconds)"
@@ -704,7 +1019,7 @@ def generate_name_error_hint(e: NameError, code: str) -> str:
     """Generate a friendly hint for name errors"""
     error_msg = str(e)
     
-    match = re.search(r"name '(\w+)' is not defined", error_msg)
+    match = NAME_ERROR_RE.search(error_msg)
     if match:
         var_name = match.group(1)
         
@@ -739,7 +1054,7 @@ def find_error_line(code: str, error_msg: str) -> Optional[int]:
     """Try to find which line caused the error"""
     try:
         lines = code.split('\n')
-        match = re.search(r"'(\w+)'", error_msg)
+        match = QUOTED_NAME_RE.search(error_msg)
         if match:
             var_name = match.group(1)
             for i, line in enumerate(lines, 1):
@@ -796,10 +1111,25 @@ if __name__ == "__main__":
     logger.info(f"📚 ReDoc: http://{settings.HOST}:{settings.PORT}/redoc")
     logger.info(f"🔗 Backend integration: {settings.BACKEND_URL}")
     
+    # uvloop/httptools come with uvicorn[standard]; uvloop is unavailable on Windows
+    try:
+        import uvloop
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+    try:
+        import httptools
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "h11"
+    logger.info(f"⚡ Event loop: {loop_impl}, HTTP parser: {http_impl}")
+    
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        loop=loop_impl,
+        http=http_impl
     )
@@ -83,14 +83,23 @@ class ComprehensiveAIEvaluator:
         
         return df
     
-    def evaluate_all_services(self):
-        """Main evaluation entry point"""
+    def evaluate_all_services(self, results: List[Dict[str, Any]] = None):
+        """Main evaluation entry point
+        
+        Args:
+            results: Benchmark results already in memory (e.g. straight from the
+                     runner). If None, the latest benchmark file is loaded.
+        """
         print("\n" + "="*80)
         print("📊 COMPREHENSIVE AI SERVICE EVALUATION")
         print("="*80 + "\n")
         
         # Load data
-        df = self.load_benchmark_data()
+        if results is not None:
+            df = pd.DataFrame(results)
+            print(f"✅ Using {len(df)} in-memory test results\n")
+        else:
+            df = self.load_benchmark_data()
         if df.empty:
             return
         
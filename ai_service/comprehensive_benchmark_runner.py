@@ -17,18 +17,372 @@ Each service is tested with diverse scenarios to evaluate:
 - Consistency across models
 """
 
+import argparse
 import asyncio
+import contextlib
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Any
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional
 import httpx
 from app.core.logger import logger
-from pathlib import Path
-import statistics
-import platform
-import sys
-from difflib import SequenceMatcher
+
+try:
+    from app.services.solution_validator import validator as _VALIDATOR
+except Exception:
+    _VALIDATOR = None
+
+# fcntl is POSIX-only; on Windows the global summary update is not file-locked
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# orjson is an optional faster JSON codec; the stdlib json module is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Single-pass classifier for the emoji / banned-term / positive-tone checks used
+# by the semantic evaluators (one regex scan instead of ~20 substring scans)
+TEXT_CHECKS_RE = re.compile(
+    r"(?P<emoji>[😀😄🤖✨🌟💡👍🎯😊])"
+    r"|(?P<banned>traceback|stack|undefined variable|error:)"
+    r"|(?P<positive>great|nice|good|excellent|well done|awesome|perfect)",
+    re.IGNORECASE
+)
+
+# Cross-model comparison file updated after every run
+GLOBAL_SUMMARY_FILE = os.path.join("data", "benchmark_results", "GLOBAL_SUMMARY.json")
+
+# Successful responses larger than this are not parsed or scored
+MAX_RESPONSE_PARSE_BYTES = 2 * 1024 * 1024
+
+# Order services are reported in
+SERVICE_ORDER = ("analyze", "chat", "hint", "behavior", "recommend")
+
+# Phrases counted as helpfulness indicators in chat responses
+CHAT_HELP_INDICATORS = ("try", "you can", "hint", "suggestion")
+
+# HTTP status codes with a fixed error category
+ERROR_STATUS_CATEGORIES = {
+    500: "ServerError",
+    400: "ValidationError",
+    422: "ValidationError",
+    404: "NotFound",
+    401: "AuthError",
+    403: "AuthError",
+}
+
+# Error-text keywords, scanned in one pass; ERROR_KEYWORD_PRIORITY decides
+# which category wins when several keywords appear ("connect" also covers
+# "connection"); the lookahead also reports overlapping keywords
+ERROR_KEYWORDS_RE = re.compile(r"(?=(timeout|connect|rate limit))")
+ERROR_KEYWORD_PRIORITY = (
+    ("timeout", "Timeout"),
+    ("connect", "ConnectionError"),
+    ("rate limit", "RateLimitError"),
+)
+
+# Provider-quota adaptation (AIMD) when requests_per_minute is set: a 429 halves
+# the quota rate and is retried after a jittered pause; every
+# RATE_LIMIT_INCREASE_EVERY successes win back RATE_LIMIT_INCREASE_STEP of the
+# configured rate
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_RETRY_DELAY = (1.0, 3.0)  # seconds, uniform jitter range
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+RATE_LIMIT_MIN_FRACTION = 0.1  # never drop below this fraction of the configured rate
+RATE_LIMIT_INCREASE_EVERY = 10
+RATE_LIMIT_INCREASE_STEP = 0.05
+
+# Shared TLS context: building one dominates httpx client construction cost
+DEFAULT_SSL_CONTEXT = ssl.create_default_context()
+
+# Fallback positive words for the semantic quality heuristic
+SEMANTIC_POSITIVE_WORDS = frozenset(
+    ["good", "great", "nice", "excellent", "well", "awesome", "helpful", "thanks", "thank"]
+)
+
+# One scan finds every positive word; longest alternatives first so that e.g.
+# "thanks" also credits the "thank" it contains
+SEMANTIC_POSITIVE_RE = re.compile(
+    "|".join(map(re.escape, sorted(SEMANTIC_POSITIVE_WORDS, key=len, reverse=True)))
+)
+SEMANTIC_POSITIVE_SUBWORDS = {
+    word: frozenset(p for p in SEMANTIC_POSITIVE_WORDS if p in word)
+    for word in SEMANTIC_POSITIVE_WORDS
+}
+
+# Characters of a response scored by _semantic_quality_score; bounds the cost
+# on very long (e.g. long-input trap) responses
+SEMANTIC_SCAN_CAP = 4096
+
+# Emoji that earn the semantic quality bonus; search stops at the first hit
+SEMANTIC_EMOJI_RE = re.compile("[🤖🌟💡]")
+
+# TextBlob is optional; resolved once on first use instead of on every score
+_TEXTBLOB = None
+_TEXTBLOB_TRIED = False
+
+
+def _get_textblob():
+    """Return the TextBlob class, or None if it isn't installed"""
+    global _TEXTBLOB, _TEXTBLOB_TRIED
+    if not _TEXTBLOB_TRIED:
+        _TEXTBLOB_TRIED = True
+        try:
+            from textblob import TextBlob
+            _TEXTBLOB = TextBlob
+        except Exception:
+            _TEXTBLOB = None
+    return _TEXTBLOB
+
+def json_loads(data):
+    """Parse JSON from str/bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON with orjson when available (non-serializable values via str)"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+    return json.dumps(obj, default=str, indent=2 if indent else None)
+
+
+def json_body(obj: Any) -> bytes:
+    """Encode a request body as compact UTF-8 JSON (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Headers for requests whose body is pre-encoded with json_body
+JSON_REQUEST_HEADERS = {"Content-Type": "application/json"}
+
+
+# Optional /analyze payload fields: camelCase API key -> snake_case test key
+ANALYZE_PAYLOAD_FIELDS = (
+    ("missionContext", "mission_context"),
+    ("studentContext", "student_context"),
+    ("submissionContext", "submission_context"),
+    ("validationContext", "validation_context"),
+    ("behaviorMetrics", "behavior_metrics"),
+)
+
+
+def build_analyze_payload(test: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """Build the camelCase /analyze payload in one pass, skipping missing fields"""
+    payload = {"missionId": test["missionId"], "aiModel": model}
+    for api_key, test_key in ANALYZE_PAYLOAD_FIELDS:
+        value = test.get(test_key)
+        if value is not None:
+            payload[api_key] = value
+    return payload
+
+
+class RateLimiter:
+    """
+    Async token bucket limiting request starts to `rate` per second.
+    
+    Unlike a fixed sleep between tests, time spent waiting on a response
+    already counts towards the budget. A rate of 0 disables limiting.
+    Must be created inside the running event loop.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self._successes = 0
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be started"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def back_off(self):
+        """Multiplicative decrease after the provider answered 429"""
+        self.rate = max(self.rate * RATE_LIMIT_DECREASE_FACTOR, self.max_rate * RATE_LIMIT_MIN_FRACTION)
+        self._successes = 0
+    
+    def record_success(self):
+        """Additive increase back towards max_rate after a run of successful requests"""
+        if self.rate >= self.max_rate:
+            return
+        self._successes += 1
+        if self._successes >= RATE_LIMIT_INCREASE_EVERY:
+            self._successes = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_LIMIT_INCREASE_STEP)
+
+
+class RunningStats:
+    """
+    Single-pass statistics for a stream of numbers.
+    
+    Mean and variance use Welford's algorithm. Values are kept unboxed in an
+    array('d') (8 bytes each) and only sorted when the median is requested.
+    """
+    __slots__ = ("n", "mean", "M2", "min", "max", "_values", "_median")
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.min = None
+        self.max = None
+        self._values = array("d")
+        self._median = None
+    
+    def update(self, value: float):
+        """Add one value"""
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.M2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._values.append(value)
+        self._median = None
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for fewer than two values)"""
+        return self.M2 / (self.n - 1) if self.n > 1 else 0.0
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0 for fewer than two values)"""
+        return self.variance ** 0.5
+    
+    @property
+    def median(self) -> float:
+        """Median of the values seen so far (0 when empty)"""
+        if not self.n:
+            return 0.0
+        if self._median is None:
+            ordered = sorted(self._values)
+            mid = self.n // 2
+            if self.n % 2:
+                self._median = ordered[mid]
+            else:
+                self._median = (ordered[mid - 1] + ordered[mid]) / 2.0
+        return self._median
+
+
+class ResultStats:
+    """Online aggregate of benchmark results (success counts and metric stats)"""
+    
+    def __init__(self):
+        self.total = 0
+        self.http_success = 0
+        self.semantic_success = 0
+        self.response_time = RunningStats()
+        self.semantic_quality = RunningStats()
+        self.reasoning_complexity = RunningStats()
+        self.error_categories = {}
+        self.categories = {}    # evaluation_category -> {"total", "success"}
+        self.difficulties = {}  # difficulty_level -> {"total", "success"}
+        self.models = {}        # model -> ResultStats
+    
+    def add(self, result: Dict[str, Any]):
+        """Fold one result into the aggregate"""
+        self.total += 1
+        semantic_ok = result.get("semantic_success", False)
+        if result.get("http_success", False):
+            self.http_success += 1
+        else:
+            error_type = result.get("error_type", "Unknown")
+            self.error_categories[error_type] = self.error_categories.get(error_type, 0) + 1
+        if semantic_ok:
+            self.semantic_success += 1
+        
+        if "response_time_ms" in result:
+            self.response_time.update(result["response_time_ms"])
+        if result.get("semantic_quality") is not None:
+            self.semantic_quality.update(result["semantic_quality"])
+        if result.get("reasoning_complexity_score") is not None:
+            self.reasoning_complexity.update(result["reasoning_complexity_score"])
+        
+        for key, groups in (
+            (result.get("evaluation_category", "general"), self.categories),
+            (result.get("difficulty_level", 0), self.difficulties),
+        ):
+            group = groups.setdefault(key, {"total": 0, "success": 0})
+            group["total"] += 1
+            if semantic_ok:
+                group["success"] += 1
+
+
+class BenchmarkStats(ResultStats):
+    """ResultStats with per-service (and per-service, per-model) breakdowns"""
+    
+    def __init__(self):
+        super().__init__()
+        self.services = {}  # service -> ResultStats
+    
+    def add(self, result: Dict[str, Any]):
+        super().add(result)
+        service = self.services.get(result["service"])
+        if service is None:
+            service = self.services[result["service"]] = ResultStats()
+        service.add(result)
+        model = service.models.get(result["model"])
+        if model is None:
+            model = service.models[result["model"]] = ResultStats()
+        model.add(result)
+    
+    @classmethod
+    def from_results(cls, results: List[Dict[str, Any]]) -> "BenchmarkStats":
+        """Aggregate an already collected result list in one pass"""
+        stats = cls()
+        for result in results:
+            stats.add(result)
+        return stats
+
+
+@dataclass
+class PreparedTest:
+    """Per-test fields derived once at load time instead of on every run"""
+    __slots__ = (
+        "timeout", "concepts_lower", "is_trap", "trap_category",
+        "expected_output", "required_concepts", "difficulty", "validation_rules",
+    )
+    timeout: float
+    concepts_lower: List[str]
+    is_trap: bool
+    trap_category: str
+    # Mission-context fields passed to the solution validator
+    expected_output: str
+    required_concepts: List[str]
+    difficulty: Any
+    validation_rules: Dict[str, Any]
 
 
 class ComprehensiveAIBenchmark:
@@ -41,12 +395,20 @@ class ComprehensiveAIBenchmark:
         ai_service_url: str = "http://localhost:8000",
         output_dir: str = "data/benchmark_results",
         delay_between_tests: float = 0.0,  # No delays - run at full speed
-        delay_between_services: float = 0.0  # No delays - run at full speed
+        delay_between_services: float = 0.0,  # Unused: services run concurrently (kept for compatibility)
+        concurrency: int = 1,  # Max in-flight requests per service (>1 adds queueing to response times)
+        requests_per_minute: float = 0.0,  # Provider quota shared by all AI requests (0: no cap)
+        request_burst: float = 1.0,  # Requests that may start back to back under the quota
+        verbose: bool = True  # Print a progress line per test (False: one line per service)
     ):
         self.ai_service_url = ai_service_url
         self.output_dir = output_dir
         self.delay_between_tests = delay_between_tests
         self.delay_between_services = delay_between_services
+        self.concurrency = max(1, concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.request_burst = max(1.0, request_burst)
+        self.verbose = verbose
         os.makedirs(output_dir, exist_ok=True)
         
         # AI models to test - ONLY the model from .env
@@ -60,29 +422,46 @@ class ComprehensiveAIBenchmark:
         self.model_output_dir = os.path.join(output_dir, model_folder)
         os.makedirs(self.model_output_dir, exist_ok=True)
         
+        # Output locations derived once; only the per-run timestamp varies
+        self._results_prefix = os.path.join(self.model_output_dir, "benchmark_")
+        self.analytics_dir = os.path.join("data", "analytics_export", model_folder)
+        os.makedirs(os.path.dirname(GLOBAL_SUMMARY_FILE), exist_ok=True)
+        
         logger.info(f"[BENCHMARK] Testing model: {self.models[0]}")
         logger.info(f"[BENCHMARK] Results will be saved to: {self.model_output_dir}")
-        logger.info(f"[BENCHMARK] Rate limiting: {self.delay_between_tests}s between tests, {self.delay_between_services}s between services")
+        logger.info(f"[BENCHMARK] Rate limiting: {self.delay_between_tests}s between tests per service")
+        logger.info(f"[BENCHMARK] Concurrency: {self.concurrency} in-flight requests per service")
+        if self.requests_per_minute > 0:
+            logger.info(f"[BENCHMARK] Provider quota: {self.requests_per_minute} AI requests/min (burst {self.request_burst:g})")
         
         # Capture environment metadata for reproducibility
+        import platform
         self.metadata = {
             "timestamp": datetime.now().isoformat(),
             "python_version": sys.version,
             "os": platform.platform(),
             "service_url": self.ai_service_url,
             "model_name": self.models[0],
-            "benchmark_version": "3.0.0"  # Updated version with research-grade features
+            "benchmark_version": "3.0.0",  # Updated version with research-grade features
+            # Load settings affect response_time_ms, so record them to compare runs
+            "concurrency": self.concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "request_burst": self.request_burst
         }
         
         # Load test scenarios from JSON files (now includes trap tests merged in)
-        self.analyze_tests = self.load_json_tests("analyze.json")
-        self.chat_tests = self.load_json_tests("chat.json")
-        self.hint_tests = self.load_json_tests("hint.json")
-        self.recommend_tests = self.load_json_tests("recommend.json")
-        self.behavior_tests = self.load_json_tests("behavior.json")
-        
-        # Load META/STRESS trap tests (cross-service tests)
-        self.meta_trap_tests = self.load_json_tests("meta_traps.json")
+        # META/STRESS trap tests (cross-service tests) are loaded alongside them.
+        # Files are independent, so read and parse them concurrently.
+        test_files = ["analyze.json", "chat.json", "hint.json", "recommend.json", "behavior.json", "meta_traps.json"]
+        with ThreadPoolExecutor(max_workers=len(test_files)) as pool:
+            (
+                self.analyze_tests,
+                self.chat_tests,
+                self.hint_tests,
+                self.recommend_tests,
+                self.behavior_tests,
+                self.meta_trap_tests,
+            ) = pool.map(self.load_json_tests, test_files)
         
         logger.info(f"[BENCHMARK] Total tests loaded:")
         logger.info(f"  - Analyze: {len(self.analyze_tests)}")
@@ -94,6 +473,125 @@ class ComprehensiveAIBenchmark:
         
         # Track results for consistency analysis (when repeat_count > 1)
         self.previous_responses = {}
+        
+        # Open JSON Lines file that results are streamed to during a run
+        self._results_stream = None
+        
+        # Summary statistics accumulated while a run is in progress
+        self._stats = BenchmarkStats()
+        
+        # Wall-clock base for result timestamps, which are taken as monotonic offsets
+        self._t0_wall = datetime.now()
+        self._t0_mono = time.monotonic()
+        
+        # (path, mtime_ns, data) of the last GLOBAL_SUMMARY.json read or written
+        self._global_summary_cache = None
+        
+        # Per-test derived fields, keyed by id() of the loaded test dicts
+        self._prepared_tests = {}
+        
+        # One pooled HTTP client per event loop, reused across benchmark runs
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        
+        # Encoded request bodies, keyed by (id(test), model or None)
+        self._request_bodies = {}
+        
+        # Static per-test result fields, built once and copied per call
+        self._result_templates = {}
+        for service_name, tests in (
+            ("analyze", self.analyze_tests),
+            ("chat", self.chat_tests),
+            ("hint", self.hint_tests),
+            ("recommend", self.recommend_tests),
+            ("behavior", self.behavior_tests),
+        ):
+            for test in tests:
+                self._result_templates[(service_name, test["id"])] = self._build_result_template(service_name, test)
+                self._prepared_tests[id(test)] = self._prepare_test(test)
+        for test in self.meta_trap_tests:
+            service_name = test.get("service", "chat")
+            self._result_templates[(service_name, test["id"])] = self._build_result_template(service_name, test)
+            self._prepared_tests[id(test)] = self._prepare_test(test)
+    
+    def _wall_timestamp(self, mono: float) -> str:
+        """ISO wall-clock timestamp for a time.monotonic() reading"""
+        return (self._t0_wall + timedelta(seconds=mono - self._t0_mono)).isoformat()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the cached HTTP client for the running event loop, creating it on first use"""
+        loop_id = id(asyncio.get_running_loop())
+        with self._clients_lock:
+            client = self._clients.get(loop_id)
+            if client is None or client.is_closed:
+                # NO timeout - AI models can take as long as needed
+                client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(None),
+                    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+                    verify=DEFAULT_SSL_CONTEXT
+                )
+                self._clients[loop_id] = client
+        return client
+    
+    async def aclose(self):
+        """Close the HTTP client bound to the running event loop"""
+        with self._clients_lock:
+            client = self._clients.pop(id(asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.aclose()
+    
+    def _build_result_template(self, service_name: str, test: Dict[str, Any]) -> MappingProxyType:
+        """Build the read-only static part of a test result"""
+        return MappingProxyType({
+            "service": service_name,
+            "test_id": test["id"],
+            "test_name": test["name"],
+            "evaluation_category": test.get("evaluation_category", "general"),
+            "difficulty_level": test.get("difficulty_level", 3),
+            "expected_behavior": test.get("expected_behavior", ""),
+        })
+    
+    def _prepare_test(self, test: Dict[str, Any]) -> PreparedTest:
+        """Precompute the derived fields used while running and scoring a test"""
+        mission_ctx = test.get("mission_context") or test.get("missionContext") or {}
+        return PreparedTest(
+            timeout=self._get_timeout_for_test(test),
+            concepts_lower=self._extract_expected_concepts(test),
+            is_trap="trap_category" in test,
+            trap_category=test.get("trap_category", "none"),
+            expected_output=mission_ctx.get("expectedOutput") or mission_ctx.get("expected_output") or mission_ctx.get("expected") or "",
+            required_concepts=mission_ctx.get("concepts") or mission_ctx.get("requiredConcepts") or [],
+            difficulty=mission_ctx.get("difficulty") or test.get("difficulty_level", "medium"),
+            validation_rules=mission_ctx.get("validationRules", {}),
+        )
+    
+    def _get_prepared(self, test: Dict[str, Any]) -> PreparedTest:
+        """Return the precomputed fields for a test, preparing it on first use"""
+        prepared = self._prepared_tests.get(id(test))
+        if prepared is None:
+            prepared = self._prepared_tests[id(test)] = self._prepare_test(test)
+        return prepared
+    
+    def _get_request_body(self, service_name: str, test: Dict[str, Any], model: str) -> bytes:
+        """Return the encoded request body for a test, built once and reused across repeats"""
+        # Only /analyze payloads carry the model; other services send the test's payload as is
+        key = (id(test), model if service_name == "analyze" else None)
+        body = self._request_bodies.get(key)
+        if body is None:
+            if service_name == "analyze":
+                # Convert snake_case keys to camelCase for API compliance
+                payload = build_analyze_payload(test, model)
+            else:
+                payload = test["payload"]
+            body = self._request_bodies[key] = json_body(payload)
+        return body
+    
+    def _new_result(self, service_name: str, test: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a fresh result dict pre-filled with the test's static fields"""
+        template = self._result_templates.get((service_name, test["id"]))
+        if template is None:
+            template = self._build_result_template(service_name, test)
+        return template.copy()
     
     def load_json_tests(self, filename: str) -> List[Dict[str, Any]]:
         """Load test cases from JSON file"""
@@ -423,95 +921,82 @@ class ComprehensiveAIBenchmark:
         client: httpx.AsyncClient
     ) -> Dict[str, Any]:
         """Test a single service endpoint with comprehensive quality metrics"""
-        start_time = datetime.now()
+        start_time = time.monotonic()
         
         # Set timeout based on test difficulty and trap category
-        timeout_seconds = self._get_timeout_for_test(test)
+        prepared = self._get_prepared(test)
+        timeout_seconds = prepared.timeout
         
         try:
             # Prepare payload
-            if service_name == "analyze":
-                # Convert snake_case keys to camelCase for API compliance
-                payload = {
-                    "missionId": test["missionId"],
-                    "aiModel": model,
-                    "missionContext": test.get("mission_context"),
-                    "studentContext": test.get("student_context"),
-                    "submissionContext": test.get("submission_context"),
-                    "validationContext": test.get("validation_context"),
-                    "behaviorMetrics": test.get("behavior_metrics")
-                }
-                # Remove None values
-                payload = {k: v for k, v in payload.items() if v is not None}
-            else:
-                payload = test["payload"]
+            body = self._get_request_body(service_name, test, model)
             
             # Make request with timeout
             try:
                 response = await asyncio.wait_for(
                     client.post(
                         f"{self.ai_service_url}/api/v1/{endpoint}",
-                        json=payload,
+                        content=body,
+                        headers=JSON_REQUEST_HEADERS,
                         timeout=httpx.Timeout(timeout_seconds)
                     ),
                     timeout=timeout_seconds + 5  # Extra 5 seconds for network overhead
                 )
             except asyncio.TimeoutError:
                 # Test exceeded timeout - mark as failure
-                end_time = datetime.now()
-                duration_ms = (end_time - start_time).total_seconds() * 1000
+                duration_ms = (time.monotonic() - start_time) * 1000
                 
-                trap_info = ""
-                if "trap_category" in test:
-                    trap_info = f" [TRAP: {test['trap_category']}]"
+                trap_info = f" [TRAP: {prepared.trap_category}]" if prepared.is_trap else ""
                 
-                return {
-                    "service": service_name,
-                    "test_id": test["id"],
-                    "test_name": test["name"],
-                    "evaluation_category": test.get("evaluation_category", "general"),
-                    "difficulty_level": test.get("difficulty_level", 3),
-                    "model": model,
-                    "http_success": False,
-                    "semantic_success": False,
-                    "success": False,
-                    "error": f"Test timeout after {timeout_seconds}s{trap_info}",
-                    "error_type": "Timeout",
-                    "response_time_ms": duration_ms,
-                    "timestamp": start_time.isoformat(),
-                    "timeout_exceeded": True,
-                    "timeout_limit_seconds": timeout_seconds,
-                    "is_trap_test": "trap_category" in test,
-                    "trap_category": test.get("trap_category", "none")
-                }
+                result = self._new_result(service_name, test)
+                result.update(
+                    model=model,
+                    http_success=False,
+                    semantic_success=False,
+                    success=False,
+                    error=f"Test timeout after {timeout_seconds}s{trap_info}",
+                    error_type="Timeout",
+                    response_time_ms=duration_ms,
+                    timestamp=self._wall_timestamp(start_time),
+                    timeout_exceeded=True,
+                    timeout_limit_seconds=timeout_seconds,
+                    is_trap_test=prepared.is_trap,
+                    trap_category=prepared.trap_category
+                )
+                return result
             
-            end_time = datetime.now()
-            duration_ms = (end_time - start_time).total_seconds() * 1000
+            duration_ms = (time.monotonic() - start_time) * 1000
             
-            result = {
-                "service": service_name,
-                "test_id": test["id"],
-                "test_name": test["name"],
-                "evaluation_category": test.get("evaluation_category", "general"),
-                "difficulty_level": test.get("difficulty_level", 3),
-                "expected_behavior": test.get("expected_behavior", ""),
-                "model": model,
-                "http_success": response.status_code == 200,
-                "status_code": response.status_code,
-                "response_time_ms": duration_ms,
-                "timestamp": start_time.isoformat()
-            }
+            result = self._new_result(service_name, test)
+            result.update(
+                model=model,
+                http_success=response.status_code == 200,
+                status_code=response.status_code,
+                response_time_ms=duration_ms,
+                timestamp=self._wall_timestamp(start_time)
+            )
             
             if response.status_code == 200:
-                response_json = response.json()
-                result["response_data"] = response_json
-                
                 # ✅ TRAP CATEGORY TRACKING
-                if "trap_category" in test:
-                    result["trap_category"] = test["trap_category"]
-                    result["is_trap_test"] = True
-                else:
-                    result["is_trap_test"] = False
+                if prepared.is_trap:
+                    result["trap_category"] = prepared.trap_category
+                result["is_trap_test"] = prepared.is_trap
+                
+                # Pathologically large bodies (e.g. runaway long-input traps) are
+                # failed without parsing to bound CPU and memory
+                body_size = len(response.content)
+                if body_size > MAX_RESPONSE_PARSE_BYTES:
+                    result.update(
+                        semantic_success=False,
+                        success=False,
+                        response_too_large=True,
+                        response_size_bytes=body_size,
+                        error=f"Response body too large to evaluate ({body_size} bytes)"
+                    )
+                    return result
+                
+                response_json = json_loads(response.content)
+                result["response_data"] = response_json
                 
                 # ✅ SEMANTIC SUCCESS DETECTION
                 semantic_success = self._evaluate_semantic_success(service_name, response_json, test)
@@ -575,26 +1060,22 @@ class ComprehensiveAIBenchmark:
             return result
             
         except Exception as e:
-            end_time = datetime.now()
-            duration_ms = (end_time - start_time).total_seconds() * 1000
+            duration_ms = (time.monotonic() - start_time) * 1000
             
             error_str = str(e)
             
-            return {
-                "service": service_name,
-                "test_id": test["id"],
-                "test_name": test["name"],
-                "evaluation_category": test.get("evaluation_category", "general"),
-                "difficulty_level": test.get("difficulty_level", 3),
-                "model": model,
-                "http_success": False,
-                "semantic_success": False,
-                "success": False,
-                "error": error_str[:500],
-                "error_type": self._categorize_error(None, error_str),
-                "response_time_ms": duration_ms,
-                "timestamp": start_time.isoformat()
-            }
+            result = self._new_result(service_name, test)
+            result.update(
+                model=model,
+                http_success=False,
+                semantic_success=False,
+                success=False,
+                error=error_str[:500],
+                error_type=self._categorize_error(None, error_str),
+                response_time_ms=duration_ms,
+                timestamp=self._wall_timestamp(start_time)
+            )
+            return result
     
     def _evaluate_semantic_success(self, service_name: str, response_json: Dict, test: Dict) -> bool:
         """
@@ -609,11 +1090,12 @@ class ComprehensiveAIBenchmark:
             text = str(response_json.get("response", "") or response_json.get("message", ""))
             if len(text) < 20:
                 return False
+            checks = self._scan_text_checks(text)
             # must include at least one friendly/assistant emoji
-            if not any(e in text for e in ["😀", "😄", "🤖", "✨", "🌟", "💡", "👍", "🎯", "😊"]):
+            if not checks["emoji"]:
                 return False
-            banned = ["traceback", "stack", "undefined variable", "error:"]
-            if any(b in text.lower() for b in banned):
+            # forbid error traces
+            if checks["banned"]:
                 return False
             return True
 
@@ -624,7 +1106,7 @@ class ComprehensiveAIBenchmark:
                 return False
             if "score" not in response_json:
                 return False
-            mission_concepts = self._extract_expected_concepts(test)
+            mission_concepts = self._get_prepared(test).concepts_lower
             if mission_concepts:
                 # ensure the feedback mentions at least one expected concept
                 if not any(c in fb.lower() for c in mission_concepts):
@@ -692,9 +1174,8 @@ class ComprehensiveAIBenchmark:
             metrics["feedback_length_chars"] = len(feedback)
             metrics["feedback_length_words"] = len(feedback.split())
             
-            # Count positive tone indicators
-            positive_words = ["great", "nice", "good", "excellent", "well done", "awesome", "perfect"]
-            metrics["tone_positive_count"] = sum(1 for word in positive_words if word in feedback.lower())
+            # Count positive tone indicators (distinct words)
+            metrics["tone_positive_count"] = len(self._scan_text_checks(feedback)["positive"]) if feedback else 0
             
             # Extract score if available
             if "score" in response_json:
@@ -713,8 +1194,8 @@ class ComprehensiveAIBenchmark:
             metrics["contains_code_example"] = "```" in message or "print(" in message
             
             # Check helpfulness indicators
-            help_indicators = ["try", "you can", "hint", "suggestion"]
-            metrics["helpfulness_indicators"] = sum(1 for indicator in help_indicators if indicator in message.lower())
+            message_lower = message.lower()
+            metrics["helpfulness_indicators"] = sum(1 for indicator in CHAT_HELP_INDICATORS if indicator in message_lower)
             
         elif service_name == "hint":
             hints = response_json.get("hints", response_json.get("hint", []))
@@ -724,7 +1205,7 @@ class ComprehensiveAIBenchmark:
             
             if hints:
                 total_hint_length = sum(len(str(h)) for h in hints)
-                metrics["avg_hint_length"] = total_hint_length / len(hints) if hints else 0
+                metrics["avg_hint_length"] = total_hint_length / len(hints)
         
         elif service_name == "recommend":
             recs = response_json.get("recommendedMissions", response_json.get("recommendations", []))
@@ -732,26 +1213,26 @@ class ComprehensiveAIBenchmark:
         
         return metrics
     
+    def _scan_text_checks(self, text: str) -> Dict[str, set]:
+        """Classify emoji, banned terms and positive words in a single regex pass"""
+        found = {"emoji": set(), "banned": set(), "positive": set()}
+        for match in TEXT_CHECKS_RE.finditer(text):
+            found[match.lastgroup].add(match.group().lower())
+        return found
+    
     def _categorize_error(self, status_code: int, error_text: str) -> str:
         """Categorize errors for better analytics"""
-        error_lower = error_text.lower()
-        
-        if status_code == 500:
-            return "ServerError"
-        elif status_code == 400 or status_code == 422:
-            return "ValidationError"
-        elif status_code == 404:
-            return "NotFound"
-        elif status_code == 401 or status_code == 403:
-            return "AuthError"
-        elif "timeout" in error_lower:
-            return "Timeout"
-        elif "connection" in error_lower or "connect" in error_lower:
-            return "ConnectionError"
-        elif "rate limit" in error_lower:
-            return "RateLimitError"
-        else:
+        category = ERROR_STATUS_CATEGORIES.get(status_code)
+        if category:
+            return category
+        if not error_text:
             return "UnknownError"
+        
+        found = set(ERROR_KEYWORDS_RE.findall(error_text.lower()))
+        for keyword, category in ERROR_KEYWORD_PRIORITY:
+            if keyword in found:
+                return category
+        return "UnknownError"
     
     def _get_timeout_for_test(self, test: Dict[str, Any]) -> float:
         """
@@ -812,30 +1293,29 @@ class ComprehensiveAIBenchmark:
         Tries to use TextBlob for sentiment polarity; falls back to a lightweight heuristic
         if TextBlob is not available.
         """
-        try:
-            from textblob import TextBlob
-            use_textblob = True
-        except Exception:
-            use_textblob = False
-
         if not text:
             return 0.0
 
         length_factor = min(len(text) / 100.0, 1.0)
 
-        if use_textblob:
+        # Only the first SEMANTIC_SCAN_CAP characters are scored for tone
+        sample = text[:SEMANTIC_SCAN_CAP]
+
+        text_blob = _get_textblob()
+        if text_blob is not None:
             try:
-                polarity = TextBlob(text).sentiment.polarity  # -1..1
+                polarity = text_blob(sample).sentiment.polarity  # -1..1
                 positivity = (polarity + 1.0) / 2.0
             except Exception:
                 positivity = 0.5
         else:
             # fallback: simple positive-word ratio
-            positives = ["good", "great", "nice", "excellent", "well", "awesome", "helpful", "thanks", "thank"]
-            lower = text.lower()
-            positivity = min(1.0, sum(1 for p in positives if p in lower) / max(1, len(positives)))
+            hits = set()
+            for match in SEMANTIC_POSITIVE_RE.finditer(sample.lower()):
+                hits |= SEMANTIC_POSITIVE_SUBWORDS[match.group()]
+            positivity = min(1.0, len(hits) / len(SEMANTIC_POSITIVE_WORDS))
 
-        emoji_bonus = 1.0 if any(e in text for e in ["🤖", "🌟", "💡"]) else 0.8
+        emoji_bonus = 1.0 if SEMANTIC_EMOJI_RE.search(sample) else 0.8
 
         score = (length_factor * 0.4) + (positivity * 0.4) + (emoji_bonus * 0.2)
         score = max(0.0, min(1.0, round(score, 2)))
@@ -847,35 +1327,200 @@ class ComprehensiveAIBenchmark:
         The validator expects actual_output to equal expected_output; we pass the
         expected_output as actual_output to force deeper analysis of structure.
         """
-        try:
-            # Import the global validator instance
-            from app.services.solution_validator import validator
-        except Exception:
+        if _VALIDATOR is None:
             return 0.0
 
-        mission_ctx = test.get("mission_context") or test.get("missionContext") or {}
-        expected_output = mission_ctx.get("expectedOutput") or mission_ctx.get("expected_output") or mission_ctx.get("expected") or ""
-        required_concepts = mission_ctx.get("concepts") or mission_ctx.get("requiredConcepts") or []
-        difficulty = mission_ctx.get("difficulty") or test.get("difficulty_level", "medium")
+        prepared = self._get_prepared(test)
 
         try:
-            validation_result = validator.validate_solution(
+            validation_result = _VALIDATOR.validate_solution(
                 code_snippet,
-                expected_output,
-                required_concepts,
-                difficulty=difficulty,
-                actual_output=expected_output,
-                validation_rules=mission_ctx.get("validationRules", {})
+                prepared.expected_output,
+                prepared.required_concepts,
+                difficulty=prepared.difficulty,
+                actual_output=prepared.expected_output,
+                validation_rules=prepared.validation_rules
             )
             # Normalize complexity score 0-100 -> 0-1
             return max(0.0, min(1.0, validation_result.complexity_score / 100.0))
         except Exception:
             return 0.0
     
-    async def run_comprehensive_benchmark(self, repeat_count: int = 1):
-        """Run comprehensive benchmark across all services"""
+    def _write_results_file(self, path: str, results: List[Dict[str, Any]], stream_path: str):
+        """
+        Write the pretty-printed results array to path one record at a time
+        (no single whole-run string), then remove the JSON Lines journal it replaces
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("[")
+            for i, result in enumerate(results):
+                f.write(",\n  " if i else "\n  ")
+                f.write(json_dumps(result, indent=True).replace("\n", "\n  "))
+            f.write("\n]" if results else "]")
+        os.replace(tmp_path, path)
+        os.remove(stream_path)
+    
+    def _record_result(self, result: Dict[str, Any]):
+        """Fold a finished result into the running stats and the streaming results file"""
+        self._stats.add(result)
+        if self._results_stream is not None:
+            self._results_stream.write(json_dumps(result) + "\n")
+    
+    async def _run_service_batch(
+        self,
+        service_name: str,
+        endpoint: str,
+        tests: List[Dict[str, Any]],
+        model: str,
+        client: httpx.AsyncClient,
+        repeat_count: int,
+        limiter: RateLimiter,
+        semaphore: asyncio.Semaphore,
+        quota: Optional[RateLimiter] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every test (x repeat_count) of one service concurrently.
+        
+        The semaphore (shared by every batch hitting the same service) bounds
+        in-flight requests while the limiter paces request starts; the optional quota limiter is shared with the other services
+        and, when enabled, adapts to 429 responses (which are retried).
+        Results are returned in test order. In quiet mode the per-test
+        progress lines are skipped and a single line is printed per service.
+        """
+        verbose = self.verbose
+        
+        async def run_one(test: Dict[str, Any], attempt: int) -> Dict[str, Any]:
+            adaptive = quota is not None and quota.rate > 0
+            async with semaphore:
+                for retry in range(RATE_LIMIT_MAX_RETRIES + 1):
+                    await limiter.acquire()
+                    if quota is not None:
+                        await quota.acquire()
+                    result = await self.test_service(service_name, endpoint, test, model, client)
+                    if not adaptive or result.get("status_code") != 429:
+                        break
+                    quota.back_off()
+                    if retry < RATE_LIMIT_MAX_RETRIES:
+                        await asyncio.sleep(random.uniform(*RATE_LIMIT_RETRY_DELAY))
+                if adaptive:
+                    if retry:
+                        result["rate_limit_retries"] = retry
+                    if result.get("status_code") != 429:
+                        quota.record_success()
+            self._record_result(result)
+            if verbose:
+                status = "✅" if result["success"] else "❌"
+                prepared = self._get_prepared(test)
+                trap_info = f"[{prepared.trap_category}] " if prepared.is_trap else ""
+                print(f"      [{attempt}/{repeat_count}] {status} {trap_info}{test['name']}: {result['response_time_ms']:.0f}ms")
+            return result
+        
+        results = await asyncio.gather(*(
+            run_one(test, attempt)
+            for test in tests
+            for attempt in range(1, repeat_count + 1)
+        ))
+        if not verbose:
+            passed = sum(1 for r in results if r["success"])
+            print(f"      {passed}/{len(results)} passed", flush=True)
+        return results
+    
+    async def _run_all_models(
+        self,
+        client: httpx.AsyncClient,
+        repeat_count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every service's tests against every configured model.
+        
+        Services hit different endpoints, so for each model they run
+        concurrently, each paced by its own rate limiter. Results keep the
+        service order below regardless of completion order.
+        """
+        # One limiter and one in-flight cap per service, so concurrent services
+        # don't share a budget and meta batches stay within their service's
+        rate = 1.0 / self.delay_between_tests if self.delay_between_tests > 0 else 0
+        limiters = {}
+        semaphores = {}
+        
+        def limiter_for(service: str) -> RateLimiter:
+            if service not in limiters:
+                limiters[service] = RateLimiter(rate)
+            return limiters[service]
+        
+        def semaphore_for(service: str) -> asyncio.Semaphore:
+            if service not in semaphores:
+                semaphores[service] = asyncio.Semaphore(self.concurrency)
+            return semaphores[service]
+        
+        # The provider's quota applies to all AI requests together; rule-based
+        # services don't call the model and skip it
+        quota = RateLimiter(self.requests_per_minute / 60.0, capacity=self.request_burst)
+        
+        def quota_for(test_model: str) -> Optional[RateLimiter]:
+            return None if test_model == "rule-based" else quota
+        
         all_results = []
+        for model_idx, model in enumerate(self.models, 1):
+            print(f"\n{'='*80}")
+            print(f"🤖 Testing Model {model_idx}/{len(self.models)}: {model}")
+            print(f"{'='*80}\n")
+            
+            # (label, service, endpoint, tests, model)
+            services_plan = [
+                ("📝 ANALYZE Service", "analyze", "analyze", self.analyze_tests, model),
+                ("💬 CHAT Service", "chat", "chat", self.chat_tests, model),
+                ("💡 HINT Service", "hint", "hint", self.hint_tests, model),
+                ("🧠 BEHAVIOR Service", "behavior", "behavior/analyze", self.behavior_tests, model),
+            ]
+            # Test RECOMMEND service (no AI model parameter) and META/STRESS traps
+            meta_plan = []
+            if model == self.models[0]:  # Only test once, not per model
+                services_plan.append(
+                    ("🎯 RECOMMEND Service", "recommend", "recommend", self.recommend_tests, "rule-based")
+                )
+                # Meta tests specify their own service, so batch them per service;
+                # they share that service's limiter and in-flight cap
+                meta_by_service = {}
+                for test in self.meta_trap_tests:
+                    meta_by_service.setdefault(test.get("service", "chat"), []).append(test)
+                for service, service_tests in meta_by_service.items():
+                    meta_plan.append((
+                        f"🧪 META/STRESS ({service})", service, service, service_tests,
+                        model if service != "recommend" else "rule-based"
+                    ))
+            
+            for label, _, _, tests, _ in services_plan + meta_plan:
+                print(f"   {label} ({len(tests)} tests)")
+            print()
+            
+            batches = await asyncio.gather(*(
+                self._run_service_batch(
+                    service, endpoint, tests, test_model, client, repeat_count,
+                    limiter_for(service), semaphore_for(service), quota_for(test_model)
+                )
+                for _, service, endpoint, tests, test_model in services_plan + meta_plan
+            ))
+            for batch in batches[:len(services_plan)]:
+                all_results.extend(batch)
+            
+            if meta_plan:
+                # Each meta batch is in test order; interleave them back into
+                # the order of the meta/stress test file
+                meta_results = {
+                    plan[1]: iter(batch)
+                    for plan, batch in zip(meta_plan, batches[len(services_plan):])
+                }
+                for test in self.meta_trap_tests:
+                    service_results = meta_results[test.get("service", "chat")]
+                    for _ in range(repeat_count):
+                        all_results.append(next(service_results))
         
+        return all_results
+    
+    async def run_comprehensive_benchmark(self, repeat_count: int = 1):
+        """Run comprehensive benchmark across all services"""
         print("\n" + "="*80)
         print("🧪 COMPREHENSIVE AI SERVICE BENCHMARK")
         print("="*80)
@@ -895,246 +1540,167 @@ class ComprehensiveAIBenchmark:
         
         print(f"⏱️  Total tests: {total_tests}\n")
         
-        # Create client with NO timeout - AI models can take as long as needed
-        timeout = httpx.Timeout(None)  # All timeouts disabled
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            for model_idx, model in enumerate(self.models, 1):
-                print(f"\n{'='*80}")
-                print(f"🤖 Testing Model {model_idx}/{len(self.models)}: {model}")
-                print(f"{'='*80}\n")
-                
-                # Test ANALYZE service
-                print(f"   📝 ANALYZE Service ({len(self.analyze_tests)} tests)")
-                for test_idx, test in enumerate(self.analyze_tests, 1):
-                    for attempt in range(1, repeat_count + 1):
-                        result = await self.test_service("analyze", "analyze", test, model, client)
-                        all_results.append(result)
-                        status = "✅" if result["success"] else "❌"
-                        print(f"      [{attempt}/{repeat_count}] {status} {test['name']}: {result['response_time_ms']:.0f}ms")
-                        
-                        # Rate limiting: wait between tests (skip on last test)
-                        if test_idx < len(self.analyze_tests) or attempt < repeat_count:
-                            await asyncio.sleep(self.delay_between_tests)
-                
-                # Delay between services to respect rate limits
-                print(f"\n   ⏸️  Waiting {self.delay_between_services}s between services...")
-                await asyncio.sleep(self.delay_between_services)
-                
-                # Test CHAT service
-                print(f"\n   💬 CHAT Service ({len(self.chat_tests)} tests)")
-                for test_idx, test in enumerate(self.chat_tests, 1):
-                    for attempt in range(1, repeat_count + 1):
-                        result = await self.test_service("chat", "chat", test, model, client)
-                        all_results.append(result)
-                        status = "✅" if result["success"] else "❌"
-                        print(f"      [{attempt}/{repeat_count}] {status} {test['name']}: {result['response_time_ms']:.0f}ms")
-                        
-                        # Rate limiting: wait between tests (skip on last test)
-                        if test_idx < len(self.chat_tests) or attempt < repeat_count:
-                            await asyncio.sleep(self.delay_between_tests)
-                
-                # Delay between services
-                print(f"\n   ⏸️  Waiting {self.delay_between_services}s between services...")
-                await asyncio.sleep(self.delay_between_services)
-                
-                # Test HINT service
-                print(f"\n   💡 HINT Service ({len(self.hint_tests)} tests)")
-                for test_idx, test in enumerate(self.hint_tests, 1):
-                    for attempt in range(1, repeat_count + 1):
-                        result = await self.test_service("hint", "hint", test, model, client)
-                        all_results.append(result)
-                        status = "✅" if result["success"] else "❌"
-                        print(f"      [{attempt}/{repeat_count}] {status} {test['name']}: {result['response_time_ms']:.0f}ms")
-                        
-                        # Rate limiting: wait between tests (skip on last test)
-                        if test_idx < len(self.hint_tests) or attempt < repeat_count:
-                            await asyncio.sleep(self.delay_between_tests)
-                
-                # Delay between services
-                print(f"\n   ⏸️  Waiting {self.delay_between_services}s between services...")
-                await asyncio.sleep(self.delay_between_services)
-                
-                # Test BEHAVIOR service
-                print(f"\n   🧠 BEHAVIOR Service ({len(self.behavior_tests)} tests)")
-                for test_idx, test in enumerate(self.behavior_tests, 1):
-                    for attempt in range(1, repeat_count + 1):
-                        result = await self.test_service("behavior", "behavior/analyze", test, model, client)
-                        all_results.append(result)
-                        status = "✅" if result["success"] else "❌"
-                        print(f"      [{attempt}/{repeat_count}] {status} {test['name']}: {result['response_time_ms']:.0f}ms")
-                        
-                        # Rate limiting: wait between tests (skip on last test)
-                        if test_idx < len(self.behavior_tests) or attempt < repeat_count:
-                            await asyncio.sleep(self.delay_between_tests)
-                
-                # Test RECOMMEND service (no AI model parameter)
-                if model == self.models[0]:  # Only test once, not per model
-                    # Delay before recommend service
-                    print(f"\n   ⏸️  Waiting {self.delay_between_services}s between services...")
-                    await asyncio.sleep(self.delay_between_services)
-                    
-                    print(f"\n   🎯 RECOMMEND Service ({len(self.recommend_tests)} tests)")
-                    for test_idx, test in enumerate(self.recommend_tests, 1):
-                        for attempt in range(1, repeat_count + 1):
-                            result = await self.test_service("recommend", "recommend", test, "rule-based", client)
-                            all_results.append(result)
-                            status = "✅" if result["success"] else "❌"
-                            print(f"      [{attempt}/{repeat_count}] {status} {test['name']}: {result['response_time_ms']:.0f}ms")
-                            
-                            # Rate limiting: wait between tests (skip on last test)
-                            if test_idx < len(self.recommend_tests) or attempt < repeat_count:
-                                await asyncio.sleep(self.delay_between_tests)
-                    
-                    # Delay before meta tests
-                    print(f"\n   ⏸️  Waiting {self.delay_between_services}s between services...")
-                    await asyncio.sleep(self.delay_between_services)
-                    
-                    # Test META/STRESS traps (cross-service tests)
-                    print(f"\n   🧪 META/STRESS Tests ({len(self.meta_trap_tests)} tests)")
-                    for test_idx, test in enumerate(self.meta_trap_tests, 1):
-                        for attempt in range(1, repeat_count + 1):
-                            # Meta tests specify their own service
-                            service = test.get("service", "chat")
-                            endpoint = service
-                            test_model = model if service != "recommend" else "rule-based"
-                            result = await self.test_service(service, endpoint, test, test_model, client)
-                            all_results.append(result)
-                            status = "✅" if result["success"] else "❌"
-                            trap_cat = test.get("trap_category", "unknown")
-                            print(f"      [{attempt}/{repeat_count}] {status} [{trap_cat}] {test['name']}: {result['response_time_ms']:.0f}ms")
-                            
-                            # Rate limiting: wait between tests (skip on last test)
-                            if test_idx < len(self.meta_trap_tests) or attempt < repeat_count:
-                                await asyncio.sleep(self.delay_between_tests)
-        
-        # Save results to model-specific directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(self.model_output_dir, f"benchmark_{timestamp}.json")
-        
-        with open(output_file, 'w') as f:
-            json.dump(all_results, f, indent=2)
+        # Reuse the pooled client (created once per event loop)
+        client = self._get_client()
         
-        print(f"\n{'='*80}")
-        print(f"✅ Comprehensive benchmark complete!")
-        print(f"📁 Results saved to: {output_file}")
-        print(f"📂 Model folder: {self.model_output_dir}")
-        print(f"{'='*80}\n")
+        # Journal each result to a JSON Lines file as it completes, so a crashed
+        # or interrupted run keeps its partial results. benchmark_<ts>.json is
+        # the artifact to read; it replaces the journal once the run finishes,
+        # so a leftover .jsonl marks an incomplete run.
+        self._t0_mono = time.monotonic()
+        self._t0_wall = datetime.now()
+        timestamp = self._t0_wall.strftime("%Y%m%d_%H%M%S")
+        output_file = f"{self._results_prefix}{timestamp}.json"
+        stream_file = f"{self._results_prefix}{timestamp}.jsonl"
+        self._stats = BenchmarkStats()
+        with open(stream_file, 'w', encoding='utf-8') as stream:
+            self._results_stream = stream
+            try:
+                all_results = await self._run_all_models(client, repeat_count)
+            finally:
+                self._results_stream = None
         
-        # Generate summary
-        self.generate_summary(all_results)
+        # Save results to model-specific directory in the background; the
+        # summary and analytics below work from the in-memory results
+        write_task = asyncio.ensure_future(
+            asyncio.to_thread(self._write_results_file, output_file, all_results, stream_file)
+        )
         
-        # 🆕 AUTOMATIC ANALYTICS GENERATION
         print(f"\n{'='*80}")
-        print(f"📊 GENERATING ANALYTICS...")
+        print(f"✅ Comprehensive benchmark complete!")
         print(f"{'='*80}\n")
         
+        # The results file must be finished even if the summary or analytics fail
         try:
-            # Import and run the evaluator
-            from comprehensive_ai_evaluator import ComprehensiveAIEvaluator
-            
-            evaluator = ComprehensiveAIEvaluator(model_folder=self.model_name)
-            evaluator.evaluate_all_services()  # This calls generate_comprehensive_report internally
+            # Generate summary
+            self.generate_summary(all_results, self._stats)
             
-            print(f"✅ Analytics generated successfully!")
-            print(f"📂 Analytics folder: data/analytics_export/{self.model_name}/")
+            # 🆕 AUTOMATIC ANALYTICS GENERATION
+            print(f"\n{'='*80}")
+            print(f"📊 GENERATING ANALYTICS...")
+            print(f"{'='*80}\n")
             
-        except Exception as e:
-            print(f"⚠️  Analytics generation failed: {e}")
-            print(f"   You can run it manually: python comprehensive_ai_evaluator.py")
+            try:
+                # Import and run the evaluator
+                from comprehensive_ai_evaluator import ComprehensiveAIEvaluator
+                
+                evaluator = ComprehensiveAIEvaluator(model_folder=self.model_name)
+                # This calls generate_comprehensive_report internally
+                await asyncio.to_thread(evaluator.evaluate_all_services, all_results)
+                
+                print(f"✅ Analytics generated successfully!")
+                print(f"📂 Analytics folder: {self.analytics_dir}/")
+                
+            except Exception as e:
+                print(f"⚠️  Analytics generation failed: {e}")
+                print(f"   You can run it manually: python comprehensive_ai_evaluator.py")
+        finally:
+            await write_task
+        
+        print(f"\n📁 Results saved to: {output_file}")
+        print(f"📂 Model folder: {self.model_output_dir}")
         
         # 🆕 CREATE/UPDATE GLOBAL SUMMARY
-        self.update_global_summary(all_results)
+        self.update_global_summary(all_results, self._stats)
         
         return all_results
     
-    def update_global_summary(self, results: List[Dict]):
-        """Create or update global summary JSON for cross-model comparison"""
-        global_summary_file = "data/benchmark_results/GLOBAL_SUMMARY.json"
+    @contextlib.contextmanager
+    def _global_summary_lock(self, path: str):
+        """Hold an exclusive lock on <path>.lock (no-op where fcntl is unavailable)"""
+        if fcntl is None:
+            yield
+            return
+        with open(path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    def _load_global_summary(self, path: str) -> Dict[str, Any]:
+        """Load the global summary, reusing the cached copy if the file is unchanged"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {"last_updated": None, "models": {}}
         
-        # Load existing global summary
-        if os.path.exists(global_summary_file):
-            with open(global_summary_file, 'r') as f:
-                global_data = json.load(f)
-        else:
-            global_data = {
-                "last_updated": None,
-                "models": {}
-            }
+        cached = self._global_summary_cache
+        if cached is not None and cached[0] == path and cached[1] == mtime_ns:
+            return cached[2]
+        with open(path, 'rb') as f:
+            return json_loads(f.read())
+    
+    def _save_global_summary(self, path: str, data: Dict[str, Any]):
+        """Atomically replace the global summary file and refresh the cache"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json_dumps(data, indent=True))
+        os.replace(tmp_path, path)
+        self._global_summary_cache = (path, os.stat(path).st_mtime_ns, data)
+    
+    def update_global_summary(self, results: List[Dict], stats: BenchmarkStats = None):
+        """Create or update global summary JSON for cross-model comparison"""
+        global_summary_file = GLOBAL_SUMMARY_FILE
+        if stats is None:
+            stats = BenchmarkStats.from_results(results)
         
         # Calculate summary for this model
         model_name = self.models[0] if self.models else "unknown"
-        
-        total_tests = len(results)
-        http_successful = [r for r in results if r.get("http_success", False)]
-        semantic_successful = [r for r in results if r.get("semantic_success", False)]
-        response_times = [r["response_time_ms"] for r in results if "response_time_ms" in r]
-        
-        # Error categorization
-        error_results = [r for r in results if not r.get("http_success", False)]
-        error_categories = {}
-        for r in error_results:
-            error_type = r.get("error_type", "Unknown")
-            error_categories[error_type] = error_categories.get(error_type, 0) + 1
+        total_tests = stats.total
+        response_times = stats.response_time
         
         # By service stats
         services_summary = {}
         for service_name in ["analyze", "chat", "hint", "recommend"]:
-            service_results = [r for r in results if r["service"] == service_name]
-            if service_results:
-                service_successful = [r for r in service_results if r.get("semantic_success", False)]
-                service_times = [r["response_time_ms"] for r in service_results]
-                # Aggregate semantic quality and reasoning complexity if present
-                service_semantic_scores = [r.get("semantic_quality") for r in service_results if r.get("semantic_quality") is not None]
-                service_reasoning_scores = [r.get("reasoning_complexity_score") for r in service_results if r.get("reasoning_complexity_score") is not None]
-
+            service = stats.services.get(service_name)
+            if service:
                 services_summary[service_name] = {
-                    "total_tests": len(service_results),
-                    "semantic_success_count": len(service_successful),
-                    "semantic_success_rate": len(service_successful) / len(service_results) * 100,
-                    "avg_response_time_ms": statistics.mean(service_times) if service_times else 0,
-                    "median_response_time_ms": statistics.median(service_times) if service_times else 0,
-                    "semantic_quality_mean": statistics.mean(service_semantic_scores) if service_semantic_scores else 0,
-                    "semantic_quality_median": statistics.median(service_semantic_scores) if service_semantic_scores else 0,
-                    "semantic_quality_stdev": statistics.stdev(service_semantic_scores) if len(service_semantic_scores) > 1 else 0,
-                    "reasoning_complexity_mean": statistics.mean(service_reasoning_scores) if service_reasoning_scores else 0,
-                    "reasoning_complexity_median": statistics.median(service_reasoning_scores) if service_reasoning_scores else 0,
-                    "reasoning_complexity_stdev": statistics.stdev(service_reasoning_scores) if len(service_reasoning_scores) > 1 else 0,
+                    "total_tests": service.total,
+                    "semantic_success_count": service.semantic_success,
+                    "semantic_success_rate": service.semantic_success / service.total * 100,
+                    "avg_response_time_ms": service.response_time.mean,
+                    "median_response_time_ms": service.response_time.median,
+                    "semantic_quality_mean": service.semantic_quality.mean,
+                    "semantic_quality_median": service.semantic_quality.median,
+                    "semantic_quality_stdev": service.semantic_quality.stdev,
+                    "reasoning_complexity_mean": service.reasoning_complexity.mean,
+                    "reasoning_complexity_median": service.reasoning_complexity.median,
+                    "reasoning_complexity_stdev": service.reasoning_complexity.stdev,
                 }
         
-        # Update global summary
-        # Aggregate semantic_quality and reasoning_complexity across all results
-        semantic_quality_scores = [r.get("semantic_quality") for r in results if r.get("semantic_quality") is not None]
-        reasoning_scores = [r.get("reasoning_complexity_score") for r in results if r.get("reasoning_complexity_score") is not None]
-
-        global_data["models"][model_name] = {
-            "last_run": datetime.now().isoformat(),
+        now = datetime.now().isoformat()
+        
+        # Summary entry for this model
+        model_entry = {
+            "last_run": now,
             "metadata": self.metadata,
             "total_tests": total_tests,
-            "http_success_count": len(http_successful),
-            "http_success_rate": len(http_successful) / total_tests * 100 if total_tests > 0 else 0,
-            "semantic_success_count": len(semantic_successful),
-            "semantic_success_rate": len(semantic_successful) / total_tests * 100 if total_tests > 0 else 0,
-            "response_time_mean_ms": statistics.mean(response_times) if response_times else 0,
-            "response_time_median_ms": statistics.median(response_times) if response_times else 0,
-            "response_time_stdev_ms": statistics.stdev(response_times) if len(response_times) > 1 else 0,
-            "response_time_min_ms": min(response_times) if response_times else 0,
-            "response_time_max_ms": max(response_times) if response_times else 0,
-            "error_categories": error_categories,
-            "semantic_quality_mean": statistics.mean(semantic_quality_scores) if semantic_quality_scores else 0,
-            "semantic_quality_median": statistics.median(semantic_quality_scores) if semantic_quality_scores else 0,
-            "semantic_quality_stdev": statistics.stdev(semantic_quality_scores) if len(semantic_quality_scores) > 1 else 0,
-            "reasoning_complexity_mean": statistics.mean(reasoning_scores) if reasoning_scores else 0,
-            "reasoning_complexity_median": statistics.median(reasoning_scores) if reasoning_scores else 0,
-            "reasoning_complexity_stdev": statistics.stdev(reasoning_scores) if len(reasoning_scores) > 1 else 0,
+            "http_success_count": stats.http_success,
+            "http_success_rate": stats.http_success / total_tests * 100 if total_tests > 0 else 0,
+            "semantic_success_count": stats.semantic_success,
+            "semantic_success_rate": stats.semantic_success / total_tests * 100 if total_tests > 0 else 0,
+            "response_time_mean_ms": response_times.mean,
+            "response_time_median_ms": response_times.median,
+            "response_time_stdev_ms": response_times.stdev,
+            "response_time_min_ms": response_times.min or 0,
+            "response_time_max_ms": response_times.max or 0,
+            "error_categories": stats.error_categories,
+            "semantic_quality_mean": stats.semantic_quality.mean,
+            "semantic_quality_median": stats.semantic_quality.median,
+            "semantic_quality_stdev": stats.semantic_quality.stdev,
+            "reasoning_complexity_mean": stats.reasoning_complexity.mean,
+            "reasoning_complexity_median": stats.reasoning_complexity.median,
+            "reasoning_complexity_stdev": stats.reasoning_complexity.stdev,
             "services": services_summary
         }
         
-        global_data["last_updated"] = datetime.now().isoformat()
-        
-        # Save global summary
-        os.makedirs(os.path.dirname(global_summary_file), exist_ok=True)
-        with open(global_summary_file, 'w') as f:
-            json.dump(global_data, f, indent=2)
+        # Read-modify-write under a file lock so concurrent runs don't drop entries
+        with self._global_summary_lock(global_summary_file):
+            global_data = self._load_global_summary(global_summary_file)
+            global_data["models"][model_name] = model_entry
+            global_data["last_updated"] = now
+            self._save_global_summary(global_summary_file, global_data)
         
         print(f"\n{'='*80}")
         print(f"🌐 GLOBAL SUMMARY UPDATED")
@@ -1144,14 +1710,22 @@ class ComprehensiveAIBenchmark:
         print(f"✅ Latest: {model_name}")
         print(f"{'='*80}\n")
     
-    def generate_summary(self, results: List[Dict]):
+    @staticmethod
+    def _service_sort_key(service_name: str):
+        """Sort key placing services in the order they are run"""
+        try:
+            return (SERVICE_ORDER.index(service_name), service_name)
+        except ValueError:
+            return (len(SERVICE_ORDER), service_name)
+    
+    def generate_summary(self, results: List[Dict], stats: BenchmarkStats = None):
         """Generate comprehensive summary with statistical analysis"""
         print("\n📊 COMPREHENSIVE BENCHMARK SUMMARY\n")
+        if stats is None:
+            stats = BenchmarkStats.from_results(results)
         
         # Overall statistics
-        total_tests = len(results)
-        http_successful = [r for r in results if r.get("http_success", False)]
-        semantic_successful = [r for r in results if r.get("semantic_success", False)]
+        total_tests = stats.total
         
         print(f"{'='*60}")
         print(f"📈 OVERALL STATISTICS")
@@ -1163,112 +1737,67 @@ class ComprehensiveAIBenchmark:
             print(f"  📋 Check that test case JSON files exist in data/test_cases/")
             return
         
-        print(f"  HTTP Success: {len(http_successful)} ({len(http_successful)/total_tests*100:.1f}%)")
-        print(f"  Semantic Success: {len(semantic_successful)} ({len(semantic_successful)/total_tests*100:.1f}%)")
+        print(f"  HTTP Success: {stats.http_success} ({stats.http_success/total_tests*100:.1f}%)")
+        print(f"  Semantic Success: {stats.semantic_success} ({stats.semantic_success/total_tests*100:.1f}%)")
         # Print aggregated semantic quality and reasoning complexity if available
-        semantic_quality_scores = [r.get("semantic_quality") for r in results if r.get("semantic_quality") is not None]
-        reasoning_scores = [r.get("reasoning_complexity_score") for r in results if r.get("reasoning_complexity_score") is not None]
-        if semantic_quality_scores:
-            print(f"  Semantic Quality (mean): {statistics.mean(semantic_quality_scores):.2f}")
-        if reasoning_scores:
-            print(f"  Reasoning Complexity (mean): {statistics.mean(reasoning_scores):.2f}")
+        if stats.semantic_quality.n:
+            print(f"  Semantic Quality (mean): {stats.semantic_quality.mean:.2f}")
+        if stats.reasoning_complexity.n:
+            print(f"  Reasoning Complexity (mean): {stats.reasoning_complexity.mean:.2f}")
         
         # Response time statistics
-        response_times = [r["response_time_ms"] for r in results if "response_time_ms" in r]
-        if response_times:
+        response_times = stats.response_time
+        if response_times.n:
             print(f"\n  Response Time Statistics:")
-            print(f"    Mean: {statistics.mean(response_times):.1f}ms")
-            print(f"    Median: {statistics.median(response_times):.1f}ms")
-            if len(response_times) > 1:
-                print(f"    Std Dev: {statistics.stdev(response_times):.1f}ms")
-            print(f"    Min: {min(response_times):.1f}ms")
-            print(f"    Max: {max(response_times):.1f}ms")
+            print(f"    Mean: {response_times.mean:.1f}ms")
+            print(f"    Median: {response_times.median:.1f}ms")
+            if response_times.n > 1:
+                print(f"    Std Dev: {response_times.stdev:.1f}ms")
+            print(f"    Min: {response_times.min:.1f}ms")
+            print(f"    Max: {response_times.max:.1f}ms")
         
         # Error categorization
-        error_results = [r for r in results if not r.get("http_success", False)]
-        if error_results:
-            error_categories = {}
-            for r in error_results:
-                error_type = r.get("error_type", "Unknown")
-                error_categories[error_type] = error_categories.get(error_type, 0) + 1
-            
+        error_count = total_tests - stats.http_success
+        if error_count:
             print(f"\n  Error Distribution:")
-            for error_type, count in sorted(error_categories.items(), key=lambda x: x[1], reverse=True):
-                print(f"    {error_type}: {count} ({count/len(error_results)*100:.1f}%)")
-        
-        # Group by service
-        services = {}
-        for result in results:
-            service = result["service"]
-            if service not in services:
-                services[service] = []
-            services[service].append(result)
+            for error_type, count in sorted(stats.error_categories.items(), key=lambda x: x[1], reverse=True):
+                print(f"    {error_type}: {count} ({count/error_count*100:.1f}%)")
         
         # Print summary by service
-        for service_name, service_results in services.items():
+        # Services finish concurrently, so order them explicitly rather than by completion
+        for service_name in sorted(stats.services, key=self._service_sort_key):
+            service = stats.services[service_name]
             print(f"\n{'='*60}")
             print(f"📦 {service_name.upper()} SERVICE")
             print(f"{'='*60}")
             
             # Service-level statistics
-            service_semantic_success = [r for r in service_results if r.get("semantic_success", False)]
-            service_times = [r["response_time_ms"] for r in service_results]
-            
-            print(f"  Tests: {len(service_results)}")
-            print(f"  Semantic Success Rate: {len(service_semantic_success)/len(service_results)*100:.1f}%")
-            print(f"  Avg Response Time: {statistics.mean(service_times):.1f}ms")
+            print(f"  Tests: {service.total}")
+            print(f"  Semantic Success Rate: {service.semantic_success/service.total*100:.1f}%")
+            print(f"  Avg Response Time: {service.response_time.mean:.1f}ms")
             
             # Evaluation category breakdown
-            categories = {}
-            for r in service_results:
-                cat = r.get("evaluation_category", "general")
-                if cat not in categories:
-                    categories[cat] = {"total": 0, "success": 0}
-                categories[cat]["total"] += 1
-                if r.get("semantic_success", False):
-                    categories[cat]["success"] += 1
-            
-            if categories:
+            if service.categories:
                 print(f"\n  By Evaluation Category:")
-                for cat, stats in sorted(categories.items()):
-                    success_rate = stats["success"] / stats["total"] * 100 if stats["total"] > 0 else 0
-                    print(f"    {cat.capitalize()}: {stats['success']}/{stats['total']} ({success_rate:.1f}%)")
+                for cat, counts in sorted(service.categories.items()):
+                    success_rate = counts["success"] / counts["total"] * 100 if counts["total"] > 0 else 0
+                    print(f"    {cat.capitalize()}: {counts['success']}/{counts['total']} ({success_rate:.1f}%)")
             
             # Difficulty level breakdown
-            difficulties = {}
-            for r in service_results:
-                diff = r.get("difficulty_level", 0)
-                if diff not in difficulties:
-                    difficulties[diff] = {"total": 0, "success": 0}
-                difficulties[diff]["total"] += 1
-                if r.get("semantic_success", False):
-                    difficulties[diff]["success"] += 1
-            
-            if difficulties:
+            if service.difficulties:
                 print(f"\n  By Difficulty Level:")
-                for diff, stats in sorted(difficulties.items()):
-                    success_rate = stats["success"] / stats["total"] * 100 if stats["total"] > 0 else 0
-                    print(f"    Level {diff}: {stats['success']}/{stats['total']} ({success_rate:.1f}%)")
+                for diff, counts in sorted(service.difficulties.items()):
+                    success_rate = counts["success"] / counts["total"] * 100 if counts["total"] > 0 else 0
+                    print(f"    Level {diff}: {counts['success']}/{counts['total']} ({success_rate:.1f}%)")
             
             # Group by model
-            models = {}
-            for result in service_results:
-                model = result["model"]
-                if model not in models:
-                    models[model] = []
-                models[model].append(result)
-            
-            for model, model_results in models.items():
-                http_successful_model = [r for r in model_results if r.get("http_success", False)]
-                semantic_successful_model = [r for r in model_results if r.get("semantic_success", False)]
-                model_times = [r["response_time_ms"] for r in model_results]
-                
+            for model, model_stats in service.models.items():
                 print(f"\n  📊 {model}:")
-                print(f"    HTTP Success: {len(http_successful_model)}/{len(model_results)} ({len(http_successful_model)/len(model_results)*100:.1f}%)")
-                print(f"    Semantic Success: {len(semantic_successful_model)}/{len(model_results)} ({len(semantic_successful_model)/len(model_results)*100:.1f}%)")
-                print(f"    Avg Response Time: {statistics.mean(model_times):.1f}ms")
-                if len(model_times) > 1:
-                    print(f"    Response Time Std Dev: {statistics.stdev(model_times):.1f}ms")
+                print(f"    HTTP Success: {model_stats.http_success}/{model_stats.total} ({model_stats.http_success/model_stats.total*100:.1f}%)")
+                print(f"    Semantic Success: {model_stats.semantic_success}/{model_stats.total} ({model_stats.semantic_success/model_stats.total*100:.1f}%)")
+                print(f"    Avg Response Time: {model_stats.response_time.mean:.1f}ms")
+                if model_stats.response_time.n > 1:
+                    print(f"    Response Time Std Dev: {model_stats.response_time.stdev:.1f}ms")
         
         print(f"\n{'='*60}")
         print(f"📁 Environment Metadata:")
@@ -1283,26 +1812,52 @@ class ComprehensiveAIBenchmark:
         print()
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the benchmark command-line options"""
+    def non_negative_float(value: str) -> float:
+        try:
+            number = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected a number, got {value!r}")
+        if not number >= 0:  # also rejects nan
+            raise argparse.ArgumentTypeError(f"must be 0 or more, got {value}")
+        return number
+    
+    parser = argparse.ArgumentParser(description="Benchmark every AI service endpoint")
+    parser.add_argument("--quiet", action="store_true",
+                        help="print one progress line per service instead of one per test")
+    parser.add_argument("--rpm", type=non_negative_float, default=0.0, metavar="N",
+                        help="cap AI requests per minute across all services (provider quota; 0: no cap)")
+    return parser.parse_args(argv)
+
+
 async def main():
     """Run comprehensive benchmark"""
+    args = parse_args()
     print("\n🚀 Starting Comprehensive AI Service Benchmark...\n")
     
-    # Check if AI service is running
+    benchmark = ComprehensiveAIBenchmark(
+        verbose=not args.quiet,
+        requests_per_minute=args.rpm
+    )
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:8000/api/v1/health", timeout=5.0)
+        # Check if AI service is running (warms up the pooled client too)
+        try:
+            response = await benchmark._get_client().get(f"{benchmark.ai_service_url}/api/v1/health", timeout=5.0)
             if response.status_code != 200:
                 print("❌ AI service is not running!")
                 print("Start it with: python -m uvicorn app.main:app --reload --port 8000")
                 return
-    except Exception as e:
-        print("❌ Cannot connect to AI service!")
-        print(f"Error: {e}")
-        print("Start it with: python -m uvicorn app.main:app --reload --port 8000")
-        return
-    
-    benchmark = ComprehensiveAIBenchmark()
-    await benchmark.run_comprehensive_benchmark(repeat_count=1)
+        except Exception as e:
+            print("❌ Cannot connect to AI service!")
+            print(f"Error: {e}")
+            print("Start it with: python -m uvicorn app.main:app --reload --port 8000")
+            return
+        
+        await benchmark.run_comprehensive_benchmark(repeat_count=1)
+    finally:
+        await benchmark.aclose()
     
     print("\n✨ Comprehensive benchmark complete!\n")
     print("📊 What was generated:")
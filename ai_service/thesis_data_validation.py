@@ -4,11 +4,12 @@ Thesis Data Validation Script
 Verifies all benchmark data is complete and ready for analysis
 """
 
-import json
 import os
-import pandas as pd
 from pathlib import Path
 
+from thesis_io import load_json_file, load_latest_benchmarks
+
+
 def validate_thesis_data():
     """Validate all collected benchmark data for thesis"""
     
@@ -33,20 +34,20 @@ def validate_thesis_data():
     found_models = []
     missing_models = []
     
-    for model in expected_models:
-        model_dir = benchmark_dir / model
-        if model_dir.exists():
-            # Find latest benchmark file
-            json_files = list(model_dir.glob("benchmark_*.json"))
-            if json_files:
-                latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
-                with open(latest_file, 'r') as f:
-                    data = json.load(f)
-                print(f"✅ {model}: {len(data)} tests - {latest_file.name}")
-                found_models.append(model)
-            else:
-                print(f"⚠️  {model}: Directory exists but no JSON files")
-                missing_models.append(model)
+    # Load the latest result file of every model directory that exists; results
+    # are printed afterwards in the expected order
+    model_dirs = [(model, benchmark_dir / model) for model in expected_models]
+    existing_dirs = [(model, model_dir) for model, model_dir in model_dirs if model_dir.exists()]
+    latest_results = {model: (path, data) for model, path, data in load_latest_benchmarks(existing_dirs)}
+    
+    for model, model_dir in model_dirs:
+        if model in latest_results:
+            latest_path, data = latest_results[model]
+            print(f"✅ {model}: {len(data)} tests - {os.path.basename(latest_path)}")
+            found_models.append(model)
+        elif model_dir.exists():
+            print(f"⚠️  {model}: Directory exists but no JSON files")
+            missing_models.append(model)
         else:
             print(f"❌ {model}: No data found")
             missing_models.append(model)
@@ -68,10 +69,9 @@ def validate_thesis_data():
     for model in found_models:
         model_analytics = analytics_dir / model
         if model_analytics.exists():
-            missing_files = []
-            for req_file in required_files:
-                if not (model_analytics / req_file).exists():
-                    missing_files.append(req_file)
+            # One directory listing instead of a stat per required file
+            present_files = {e.name for e in os.scandir(model_analytics)}
+            missing_files = [f for f in required_files if f not in present_files]
             
             if missing_files:
                 print(f"⚠️  {model}: Missing {len(missing_files)} files")
@@ -88,8 +88,7 @@ def validate_thesis_data():
     
     global_summary = benchmark_dir / "GLOBAL_SUMMARY.json"
     if global_summary.exists():
-        with open(global_summary, 'r') as f:
-            summary = json.load(f)
+        summary = load_json_file(global_summary)
         
         models_in_summary = list(summary.get("models", {}).keys())
         print(f"✅ Global summary exists")
@@ -0,0 +1,132 @@
+"""
+Thesis Benchmark I/O
+Shared loading helpers for the thesis validation, analysis and visualization scripts
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# orjson is optional; it parses the benchmark result files several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Low-cardinality string columns stored as pandas categoricals, so groupbys and
+# comparisons work on integer codes instead of hashing strings per row
+CATEGORICAL_COLUMNS = ('model_name', 'service', 'model', 'pattern')
+
+
+def load_json_file(path):
+    """Read and parse a UTF-8 JSON file (orjson when available)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+@lru_cache(maxsize=32)
+def load_results_file(path: str, mtime_ns: int):
+    """
+    Parse a benchmark results file.
+
+    Cached on (path, mtime) so repeated runs in one process (e.g. a notebook)
+    skip unchanged files; the returned records must not be mutated.
+    """
+    return load_json_file(path)
+
+
+def find_latest_benchmark(model_dir):
+    """
+    Find a model directory's most recent benchmark_*.json file.
+
+    Returns (path, mtime_ns), or None when there are no result files. scandir
+    entries cache their stat results, so each file is stat'ed only once.
+    """
+    latest = None
+    latest_mtime = -1
+    with os.scandir(model_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith("benchmark_") and entry.name.endswith(".json"):
+                mtime = entry.stat().st_mtime_ns
+                if mtime > latest_mtime:
+                    latest, latest_mtime = entry.path, mtime
+    return (latest, latest_mtime) if latest else None
+
+
+def load_latest_benchmarks(model_dirs):
+    """
+    Load the most recent benchmark results of several models.
+
+    Takes (model name, directory) pairs and returns (model name, path, records)
+    for the models that have result files, in the order given.
+    """
+    latest_files = []
+    for model_name, model_dir in model_dirs:
+        latest = find_latest_benchmark(model_dir)
+        if latest:
+            latest_files.append((model_name, *latest))
+
+    # Reading and parsing is I/O-bound, so overlap the files on a few threads
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(latest_files)))) as pool:
+        results = list(pool.map(lambda item: load_results_file(item[1], item[2]), latest_files))
+    return [(model_name, path, data) for (model_name, path, _), data in zip(latest_files, results)]
+
+
+def extract_response_fields(response_data, fields, include_is_valid=False):
+    """
+    Pull several keys out of the response_data dicts in a single pass.
+
+    fields maps column name -> (response_data key, default). Returns
+    {column: Series}; rows whose response isn't a dict get the defaults. With
+    include_is_valid, an 'is_valid' column (isValid or is_valid) is added too.
+    """
+    # Only the pandas-based scripts call this, so the validation script never imports pandas
+    import pandas as pd
+
+    items = list(fields.items())
+    columns = {name: [] for name in fields}
+    is_valid = []
+    for response in response_data:
+        if isinstance(response, dict):
+            for name, (key, default) in items:
+                columns[name].append(response.get(key, default))
+            if include_is_valid:
+                is_valid.append(response.get('isValid') or response.get('is_valid'))
+        else:
+            for name, (key, default) in items:
+                columns[name].append(default)
+            if include_is_valid:
+                is_valid.append(None)
+    if include_is_valid:
+        columns['is_valid'] = is_valid
+    return {name: pd.Series(values, index=response_data.index) for name, values in columns.items()}
+
+
+# Stand-in for a missing validation verdict, so that comparing verdicts treats
+# two missing values as equal, as Python's None == None does
+_MISSING_VERDICT = object()
+
+
+def validation_correctness(is_valid, expected_result):
+    """
+    Whether each validation verdict matches the expected result's isValid.
+
+    Returns an object Series of True/False, with None where the expected result
+    has no isValid to compare against.
+    """
+    has_expected = expected_result.map(lambda e: isinstance(e, dict) and 'isValid' in e).astype(bool)
+    expected_valid = expected_result.where(has_expected).map(
+        lambda e: e['isValid'] if isinstance(e, dict) else _MISSING_VERDICT
+    )
+    matches = is_valid.fillna(_MISSING_VERDICT) == expected_valid.fillna(_MISSING_VERDICT)
+    return matches.astype(object).where(has_expected, None)
+
+
+def categorize_columns(df):
+    """Store the CATEGORICAL_COLUMNS present in df as pandas categoricals"""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype('category')
+    return df
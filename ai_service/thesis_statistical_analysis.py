@@ -4,14 +4,22 @@ Cross-Model Statistical Analysis for Thesis
 Performs comprehensive statistical analysis across all tested AI models
 """
 
-import json
+import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from scipy import stats
-from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from thesis_io import (
+    categorize_columns,
+    extract_response_fields,
+    load_latest_benchmarks,
+    validation_correctness,
+)
+
+# Success rates in the comparison tables are shown as percentages like "87.5%"
+PERCENT_FORMAT = '{:.1f}%'
+
 
 class ThesisStatisticalAnalysis:
     """Statistical analysis for thesis research"""
@@ -23,29 +31,21 @@ class ThesisStatisticalAnalysis:
         
     def load_all_model_data(self):
         """Load benchmark data for all models"""
-        all_data = []
+        frames = []
         
-        for model_dir in self.benchmark_dir.iterdir():
-            if not model_dir.is_dir() or model_dir.name == "GLOBAL_SUMMARY.json":
-                continue
-            
-            # Find latest benchmark file
-            json_files = list(model_dir.glob("benchmark_*.json"))
-            if not json_files:
+        with os.scandir(self.benchmark_dir) as entries:
+            model_dirs = [(e.name, e.path) for e in entries if e.is_dir()]
+        
+        for model_name, _, data in load_latest_benchmarks(model_dirs):
+            if not data:
                 continue
             
-            latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
-            
-            with open(latest_file, 'r') as f:
-                data = json.load(f)
-            
-            # Add model name to each record
-            for record in data:
-                record['model_name'] = model_dir.name
-            
-            all_data.extend(data)
+            # Build the model's frame and add its name as one column
+            model_df = pd.DataFrame(data)
+            model_df['model_name'] = model_name
+            frames.append(model_df)
         
-        df = pd.DataFrame(all_data)
+        df = categorize_columns(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame())
         print(f"✅ Loaded {len(df)} total test results from {df['model_name'].nunique()} models")
         return df
     
@@ -55,12 +55,23 @@ class ThesisStatisticalAnalysis:
         print("📊 OVERALL MODEL PERFORMANCE")
         print("="*80)
         
-        # Group by model
-        model_stats = df.groupby('model_name').agg({
-            'success': ['count', 'sum', 'mean'],
-            'semantic_success': ['sum', 'mean'],
-            'response_time_ms': ['mean', 'median', 'std', 'min', 'max']
-        }).round(2)
+        # Group by model once and reduce each column directly
+        by_model = df.groupby('model_name', sort=False, observed=True)
+        success = by_model['success']
+        semantic = by_model['semantic_success']
+        response_time = by_model['response_time_ms']
+        model_stats = pd.DataFrame({
+            ('success', 'count'): success.count(),
+            ('success', 'sum'): success.sum(),
+            ('success', 'mean'): success.mean(),
+            ('semantic_success', 'sum'): semantic.sum(),
+            ('semantic_success', 'mean'): semantic.mean(),
+            ('response_time_ms', 'mean'): response_time.mean(),
+            ('response_time_ms', 'median'): response_time.median(),
+            ('response_time_ms', 'std'): response_time.std(),
+            ('response_time_ms', 'min'): response_time.min(),
+            ('response_time_ms', 'max'): response_time.max()
+        }).sort_index().round(2)
         
         print("\nModel Performance Summary:")
         print(model_stats)
@@ -79,7 +90,7 @@ class ThesisStatisticalAnalysis:
         print("="*80)
         
         # Group by model and service
-        service_stats = df.groupby(['model_name', 'service']).agg({
+        service_stats = df.groupby(['model_name', 'service'], observed=True).agg({
             'success': ['count', 'mean'],
             'semantic_success': 'mean',
             'response_time_ms': ['mean', 'median']
@@ -101,16 +112,22 @@ class ThesisStatisticalAnalysis:
         print("📈 STATISTICAL SIGNIFICANCE TESTS")
         print("="*80)
         
-        models = df['model_name'].unique()
         results = []
         
         # Response time comparison (ANOVA)
         print("\n1️⃣ Response Time Comparison (ANOVA)")
         
-        # Only compare AI models (exclude rule-based)
-        ai_models_df = df[df['model'] != 'rule-based']
-        groups = [ai_models_df[ai_models_df['model_name'] == model]['response_time_ms'].dropna() 
-                  for model in ai_models_df['model_name'].unique()]
+        # Only compare AI models (exclude rule-based), keeping just the columns
+        # the tests need rather than copying response_data along with the rows
+        ai_models_df = df.loc[df['model'] != 'rule-based', ['model_name', 'response_time_ms']]
+        ai_models = ai_models_df['model_name'].unique().tolist()
+        
+        # One groupby scan instead of a boolean mask per model
+        response_time_arrays = {
+            model: grp.dropna().to_numpy()
+            for model, grp in ai_models_df.groupby('model_name', observed=True, sort=False)['response_time_ms']
+        }
+        groups = list(response_time_arrays.values())
         
         if len(groups) > 1:
             f_stat, p_value = stats.f_oneway(*groups)
@@ -129,32 +146,41 @@ class ThesisStatisticalAnalysis:
                 'significant': p_value < 0.05
             })
         
-        # Pairwise comparisons (t-tests)
-        print("\n2️⃣ Pairwise Response Time Comparisons (t-tests)")
-        
-        ai_models = ai_models_df['model_name'].unique()
-        for i, model1 in enumerate(ai_models):
-            for model2 in ai_models[i+1:]:
-                group1 = ai_models_df[ai_models_df['model_name'] == model1]['response_time_ms'].dropna()
-                group2 = ai_models_df[ai_models_df['model_name'] == model2]['response_time_ms'].dropna()
-                
-                t_stat, p_value = stats.ttest_ind(group1, group2)
-                
-                print(f"\n   {model1} vs {model2}:")
-                print(f"   T-statistic: {t_stat:.4f}, P-value: {p_value:.6f}")
-                
-                if p_value < 0.05:
-                    faster = model1 if group1.mean() < group2.mean() else model2
-                    print(f"   ✅ Significant difference - {faster} is faster")
-                else:
-                    print(f"   ⚠️  No significant difference")
-                
-                results.append({
-                    'test': f't-test: {model1} vs {model2}',
-                    't_statistic': t_stat,
-                    'p_value': p_value,
-                    'significant': p_value < 0.05
-                })
+        # Pairwise comparisons (Welch's t-tests)
+        print("\n2️⃣ Pairwise Response Time Comparisons (Welch's t-tests)")
+        
+        # Every pair's t-test only needs each model's mean, std and count, so
+        # summarize once and run all pairs in one vectorized call. Response-time
+        # variances differ a lot between models, so use Welch's t-test.
+        response_times = ai_models_df.groupby('model_name', observed=True)['response_time_ms']
+        means = response_times.mean().reindex(ai_models).to_numpy()
+        stds = response_times.std().reindex(ai_models).to_numpy()
+        counts = response_times.count().reindex(ai_models).to_numpy()
+        first, second = np.triu_indices(len(ai_models), k=1)
+        t_stats, p_values = stats.ttest_ind_from_stats(
+            means[first], stds[first], counts[first],
+            means[second], stds[second], counts[second],
+            equal_var=False
+        )
+        
+        for i, j, t_stat, p_value in zip(first, second, t_stats, p_values):
+            model1, model2 = ai_models[i], ai_models[j]
+            
+            print(f"\n   {model1} vs {model2}:")
+            print(f"   T-statistic: {t_stat:.4f}, P-value: {p_value:.6f}")
+            
+            if p_value < 0.05:
+                faster = model1 if means[i] < means[j] else model2
+                print(f"   ✅ Significant difference - {faster} is faster")
+            else:
+                print(f"   ⚠️  No significant difference")
+            
+            results.append({
+                'test': f"Welch's t-test: {model1} vs {model2}",
+                't_statistic': t_stat,
+                'p_value': p_value,
+                'significant': p_value < 0.05
+            })
         
         # Save results
         results_df = pd.DataFrame(results)
@@ -170,22 +196,23 @@ class ThesisStatisticalAnalysis:
         print("🎯 AI RESPONSE QUALITY ANALYSIS")
         print("="*80)
         
+        # Each service subset selects only the columns it needs and adds its
+        # derived metrics in one .assign, instead of copying every column
+        
         # Analyze ANALYZE service
-        analyze_df = df[df['service'] == 'analyze'].copy()
+        analyze_df = df.loc[df['service'] == 'analyze', ['model_name', 'response_data']]
         
         if not analyze_df.empty:
             print("\n📝 ANALYZE Service Quality:")
             
-            # Extract feedback from response_data
-            analyze_df['feedback_text'] = analyze_df['response_data'].apply(
-                lambda x: x.get('feedback', '') if isinstance(x, dict) else ''
-            )
-            analyze_df['feedback_length'] = analyze_df['feedback_text'].apply(len)
-            analyze_df['ai_score'] = analyze_df['response_data'].apply(
-                lambda x: x.get('score', 0) if isinstance(x, dict) else 0
+            # Extract feedback and score from response_data
+            fields = extract_response_fields(analyze_df['response_data'], {'feedback': ('feedback', ''), 'score': ('score', 0)})
+            analyze_df = analyze_df.assign(
+                feedback_length=fields['feedback'].str.len(),
+                ai_score=fields['score']
             )
             
-            quality_stats = analyze_df.groupby('model_name').agg({
+            quality_stats = analyze_df.groupby('model_name', observed=True).agg({
                 'feedback_length': ['mean', 'median', 'std'],
                 'ai_score': ['mean', 'median', 'std']
             }).round(2)
@@ -197,17 +224,15 @@ class ThesisStatisticalAnalysis:
             print(f"\n✅ Saved to: {output_file}")
         
         # Analyze CHAT service
-        chat_df = df[df['service'] == 'chat'].copy()
+        chat_df = df.loc[df['service'] == 'chat', ['model_name', 'response_data']]
         
         if not chat_df.empty:
             print("\n💬 CHAT Service Quality:")
             
-            chat_df['response_text'] = chat_df['response_data'].apply(
-                lambda x: x.get('response', '') if isinstance(x, dict) else ''
-            )
-            chat_df['response_length'] = chat_df['response_text'].apply(len)
+            fields = extract_response_fields(chat_df['response_data'], {'response': ('response', '')})
+            chat_df = chat_df.assign(response_length=fields['response'].str.len())
             
-            quality_stats = chat_df.groupby('model_name').agg({
+            quality_stats = chat_df.groupby('model_name', observed=True).agg({
                 'response_length': ['mean', 'median', 'std']
             }).round(2)
             
@@ -218,22 +243,21 @@ class ThesisStatisticalAnalysis:
             print(f"\n✅ Saved to: {output_file}")
         
         # Analyze BEHAVIOR service
-        behavior_df = df[df['service'] == 'behavior'].copy()
+        behavior_df = df.loc[df['service'] == 'behavior', ['model_name', 'response_data']]
         
         if not behavior_df.empty:
             print("\n🧠 BEHAVIOR Service Quality:")
             
             # Extract behavior-specific metrics
-            behavior_df['pattern'] = behavior_df['response_data'].apply(
-                lambda x: x.get('pattern', '') if isinstance(x, dict) else ''
-            )
-            behavior_df['hint_text'] = behavior_df['response_data'].apply(
-                lambda x: x.get('hint', '') if isinstance(x, dict) else ''
+            fields = extract_response_fields(behavior_df['response_data'], {'pattern': ('pattern', ''), 'hint': ('hint', '')})
+            hint_text = fields['hint']
+            behavior_df = behavior_df.assign(
+                pattern=fields['pattern'],
+                hint_provided=hint_text.astype(bool).astype(int),
+                hint_length=hint_text.where(hint_text.map(type).eq(str), '').str.len()
             )
-            behavior_df['hint_provided'] = behavior_df['hint_text'].apply(lambda x: 1 if x else 0)
-            behavior_df['hint_length'] = behavior_df['hint_text'].apply(lambda x: len(x) if isinstance(x, str) else 0)
             
-            quality_stats = behavior_df.groupby('model_name').agg({
+            quality_stats = behavior_df.groupby('model_name', observed=True).agg({
                 'hint_provided': ['sum', 'mean'],  # Total hints and intervention rate
                 'hint_length': ['mean', 'median', 'std']  # Hint quality
             }).round(2)
@@ -242,7 +266,7 @@ class ThesisStatisticalAnalysis:
             
             # Pattern detection analysis
             print("\n   Pattern Detection Distribution:")
-            pattern_dist = behavior_df.groupby(['model_name', 'pattern']).size().unstack(fill_value=0)
+            pattern_dist = behavior_df.groupby(['model_name', 'pattern'], observed=True).size().unstack(fill_value=0)
             print(pattern_dist)
             
             output_file = self.output_dir / "behavior_quality_metrics.csv"
@@ -255,35 +279,29 @@ class ThesisStatisticalAnalysis:
             print(f"✅ Saved pattern distribution to: {pattern_file}")
         
         # Analyze VALIDATION service
-        validation_df = df[df['service'] == 'validation'].copy()
+        validation_columns = [c for c in ('model_name', 'response_data', 'expected_result') if c in df]
+        validation_df = df.loc[df['service'] == 'validation', validation_columns]
         
         if not validation_df.empty:
             print("\n✅ VALIDATION Service Quality:")
             
             # Extract validation-specific metrics
-            validation_df['is_valid'] = validation_df['response_data'].apply(
-                lambda x: x.get('isValid') or x.get('is_valid') if isinstance(x, dict) else None
-            )
-            validation_df['hardcoding_detected'] = validation_df['response_data'].apply(
-                lambda x: x.get('hardcodingDetected', False) if isinstance(x, dict) else False
-            )
-            validation_df['creativity_score'] = validation_df['response_data'].apply(
-                lambda x: x.get('creativityScore', 0) if isinstance(x, dict) else 0
-            )
-            validation_df['complexity_score'] = validation_df['response_data'].apply(
-                lambda x: x.get('complexityScore', 0) if isinstance(x, dict) else 0
+            fields = extract_response_fields(
+                validation_df['response_data'],
+                {
+                    'hardcoding_detected': ('hardcodingDetected', False),
+                    'creativity_score': ('creativityScore', 0),
+                    'complexity_score': ('complexityScore', 0)
+                },
+                include_is_valid=True
             )
+            validation_df = validation_df.assign(**fields)
             
             # Calculate validation accuracy (if expected results exist)
-            validation_df['correct_validation'] = validation_df.apply(
-                lambda row: (
-                    row['is_valid'] == row.get('expected_result', {}).get('isValid')
-                    if isinstance(row.get('expected_result'), dict) and 'isValid' in row.get('expected_result', {})
-                    else None
-                ), axis=1
-            )
+            expected = validation_df.get('expected_result', pd.Series(None, index=validation_df.index, dtype=object))
+            validation_df['correct_validation'] = validation_correctness(validation_df['is_valid'], expected)
             
-            quality_stats = validation_df.groupby('model_name').agg({
+            quality_stats = validation_df.groupby('model_name', observed=True).agg({
                 'hardcoding_detected': ['sum', 'mean'],  # Detection rate
                 'creativity_score': ['mean', 'median', 'std'],
                 'complexity_score': ['mean', 'median', 'std']
@@ -292,7 +310,7 @@ class ThesisStatisticalAnalysis:
             print(quality_stats)
             
             # Validation accuracy
-            accuracy_stats = validation_df[validation_df['correct_validation'].notna()].groupby('model_name')['correct_validation'].agg(['sum', 'count', 'mean'])
+            accuracy_stats = validation_df[validation_df['correct_validation'].notna()].groupby('model_name', observed=True)['correct_validation'].agg(['sum', 'count', 'mean'])
             if not accuracy_stats.empty:
                 print("\n   Validation Accuracy:")
                 print(accuracy_stats)
@@ -313,33 +331,39 @@ class ThesisStatisticalAnalysis:
         print("📋 GENERATING COMPARISON TABLES")
         print("="*80)
         
-        # Table 1: Overall Performance
-        overall = df.groupby('model_name').agg({
-            'success': ['count', lambda x: f"{(x.sum()/len(x)*100):.1f}%"],
-            'semantic_success': lambda x: f"{(x.sum()/len(x)*100):.1f}%",
-            'response_time_ms': ['mean', 'median']
+        # Table 1: Overall Performance (numeric aggregation first, formatting last)
+        totals = df.groupby('model_name', observed=True).agg(
+            tests=('success', 'count'),
+            size=('success', 'size'),
+            http_ok=('success', 'sum'),
+            semantic_ok=('semantic_success', 'sum'),
+            mean_time=('response_time_ms', 'mean'),
+            median_time=('response_time_ms', 'median')
+        )
+        
+        overall = pd.DataFrame({
+            'Total Tests': totals['tests'],
+            'HTTP Success': (totals['http_ok'] / totals['size'] * 100).map(PERCENT_FORMAT.format),
+            'Semantic Success': (totals['semantic_ok'] / totals['size'] * 100).map(PERCENT_FORMAT.format),
+            'Mean Time (ms)': totals['mean_time'].round(0).astype(int),
+            'Median Time (ms)': totals['median_time'].round(0).astype(int)
         })
         
-        overall.columns = ['Total Tests', 'HTTP Success', 'Semantic Success', 
-                          'Mean Time (ms)', 'Median Time (ms)']
-        overall['Mean Time (ms)'] = overall['Mean Time (ms)'].round(0).astype(int)
-        overall['Median Time (ms)'] = overall['Median Time (ms)'].round(0).astype(int)
-        
         print("\nTable 1: Overall Model Performance")
         print(overall.to_markdown())
         
         output_file = self.output_dir / "table1_overall_performance.csv"
         overall.to_csv(output_file)
         
-        # Table 2: Service-Specific Performance
-        service_perf = df.groupby(['service', 'model_name']).agg({
-            'semantic_success': lambda x: f"{(x.sum()/len(x)*100):.1f}%",
-            'response_time_ms': lambda x: f"{x.mean():.0f}"
-        }).reset_index()
-        
-        service_pivot = service_perf.pivot(index='service', 
-                                           columns='model_name', 
-                                           values='semantic_success')
+        # Table 2: Service-Specific Performance (numeric pivot, formatted afterwards)
+        success_rates = df.pivot_table(index='service',
+                                       columns='model_name',
+                                       values='semantic_success',
+                                       aggfunc='mean',
+                                       observed=True) * 100
+        # DataFrame.map is pandas >= 2.1; 2.0 only has the older applymap
+        format_cells = success_rates.map if hasattr(pd.DataFrame, 'map') else success_rates.applymap
+        service_pivot = format_cells(PERCENT_FORMAT.format, na_action='ignore')
         
         print("\nTable 2: Success Rate by Service")
         print(service_pivot.to_markdown())